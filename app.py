@@ -1,16 +1,42 @@
-from flask import Flask, render_template, request, redirect, url_for, flash, jsonify
+from flask import Flask, render_template, request, redirect, url_for, flash, jsonify, abort, g, has_request_context
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
 from werkzeug.security import generate_password_hash, check_password_hash
 from flask_login import LoginManager, UserMixin, login_user, logout_user, login_required, current_user
-from werkzeug.utils import secure_filename
 import os
 import re
+import base64
+import sqlite3
+import time
+import hashlib
+import tempfile
+import shutil
+import bisect
+import threading
+import multiprocessing
+import logging
+import uuid
+from array import array
+from contextlib import contextmanager
+from functools import wraps
+from collections import Counter
+from io import BytesIO
 from datetime import datetime, timedelta
 import PyPDF2
 from docx import Document
+import numpy as np
+from scipy.sparse import csr_matrix
 from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+from sklearn.preprocessing import normalize
+from sklearn.decomposition import TruncatedSVD
+from sklearn.cluster import MiniBatchKMeans
 import json
+import zlib
+try:
+    import fcntl
+except ImportError:  # Windows, where index writers are not serialized
+    fcntl = None
 
 # ========== APP CONFIGURATION ========== #
 
@@ -23,28 +49,178 @@ def from_json_filter(value):
     except:
         return []
 app.config['SECRET_KEY'] = 'your-secret-key-change-in-production'
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///resume.db'
+app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get('DATABASE_URL', 'sqlite:///resume.db')
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+# Applied to every new SQLite connection; WAL lets readers run during upload writes
+app.config['SQLITE_PRAGMAS'] = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'cache_size': -64000,
+    'mmap_size': 256 * 1024 * 1024,
+    'temp_store': 'MEMORY',
+    'busy_timeout': 5000
+}
 app.config['UPLOAD_FOLDER'] = 'uploads'
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024
 app.config['ALLOWED_EXTENSIONS'] = {'pdf', 'docx'}
 
+# Background resume parsing (0 workers parses inside the upload request)
+app.config['PARSE_QUEUE_WORKERS'] = 2
+app.config['PARSE_QUEUE_MAX_LENGTH'] = 200
+app.config['PARSE_QUEUE_TASK_TIMEOUT'] = 60
+app.config['PARSE_QUEUE_POLL_INTERVAL'] = 1.0
+
+# Resumes scored per chunk by BatchMatcher.rematch_all
+app.config['BATCH_MATCH_CHUNK_SIZE'] = 500
+# Match rows kept per resume (0 stores every active job)
+app.config['MATCH_TOP_K'] = 10
+# Next-best jobs remembered per resume beyond MATCH_TOP_K, so a deactivated
+# job's slot is refilled without re-scoring the resume
+app.config['MATCH_RUNNER_UPS'] = 10
+app.config['JOB_SEARCH_PER_PAGE'] = 20
+# Rows per page on keyset-paginated lists (jobs, admin jobs, admin users)
+app.config['PAGE_SIZE'] = 20
+# Reverse skill index: resumes fully scored per job, and rebuild age in seconds
+app.config['CANDIDATE_POOL_SIZE'] = 500
+app.config['CANDIDATE_INDEX_MAX_AGE'] = 600
+# Seconds the admin dashboard counters may be served from cache
+app.config['ADMIN_STATS_TTL'] = 60
+# Prometheus-text /metrics endpoint and one JSON log line per request
+app.config['METRICS_ENABLED'] = True
+app.config['REQUEST_LOG_ENABLED'] = True
+# Items accepted per /api/v1 batch request
+app.config['API_BATCH_MAX_FILES'] = 50
+app.config['API_BATCH_MAX_RESUMES'] = 500
+# Approximate matching for large job boards: LSA embeddings and an IVF index
+# pick SEMANTIC_CANDIDATES jobs per resume, and only those get exact scores
+app.config['SEMANTIC_MATCHING'] = False
+app.config['SEMANTIC_DIMENSIONS'] = 128
+app.config['SEMANTIC_CANDIDATES'] = 200
+app.config['SEMANTIC_NPROBE'] = 8
+# Share of jobs added, edited or removed since the last fit before it is refit in the background
+app.config['SEMANTIC_REFIT_FRACTION'] = 0.2
+# Memory-mapped job index generations shared by all worker processes (None keeps it in process memory)
+app.config['INDEX_FOLDER'] = 'indexes'
+
 os.makedirs('uploads', exist_ok=True)
 
 db = SQLAlchemy(app)
+
+@event.listens_for(Engine, 'connect')
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Apply the SQLite performance profile to each new connection"""
+    if not isinstance(dbapi_connection, sqlite3.Connection):
+        return
+    
+    cursor = dbapi_connection.cursor()
+    for name, value in app.config['SQLITE_PRAGMAS'].items():
+        cursor.execute(f"PRAGMA {name}={value}")
+    cursor.close()
+
+@event.listens_for(Engine, 'before_cursor_execute')
+def start_query_timer(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('query_started', []).append(time.perf_counter())
+
+@event.listens_for(Engine, 'after_cursor_execute')
+def stop_query_timer(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info['query_started'].pop()
+    operation = statement.lstrip()[:6].lower()
+    if operation not in ('select', 'insert', 'update', 'delete'):
+        operation = 'other'
+    metrics.observe('db_query_seconds', elapsed, operation=operation)
+
+@event.listens_for(Engine, 'handle_error')
+def drop_query_timer(context):
+    # A failed statement never reaches after_cursor_execute, so its start
+    # time would otherwise stay on the pooled connection
+    started = context.connection.info.get('query_started') if context.connection is not None else None
+    if started:
+        started.pop()
+
+request_log = logging.getLogger('resume_app.requests')
+if not request_log.handlers:
+    request_log.addHandler(logging.StreamHandler())
+    request_log.setLevel(logging.INFO)
+    request_log.propagate = False
+
 login_manager = LoginManager()
 login_manager.init_app(app)
 login_manager.login_view = 'login'
 
 # ========== DATABASE MODELS ========== #
 
+class CompressedText(db.TypeDecorator):
+    """Unicode text stored as raw deflate against a shared resume dictionary.
+    
+    The dictionary is hand-written from common resume vocabulary, not
+    trained on stored text. Each value starts with a one-byte format tag
+    naming the dictionary it was compressed with, so a dictionary trained
+    on real resumes can be added later without breaking stored rows. Plain text written before compression existed
+    is read back unchanged until compress_db.py rewrites it.
+    """
+    
+    impl = db.Text
+    cache_ok = True
+    
+    FORMAT = 1
+    # Format 1 dictionary. Never edit it, add a new format instead.
+    # Strings that occur most often sit at the end, where deflate
+    # reaches them with the shortest distances.
+    DICTIONARY = (
+        "curriculum vitae resume profile objective summary references available upon request "
+        "certifications certified awards achievements publications languages english hindi "
+        "interests hobbies volunteer leadership communication teamwork problem solving "
+        "january february march april may june july august september october november december "
+        "jan feb mar apr jun jul aug sep oct nov dec present current till date "
+        "university college institute school of engineering technology science computer "
+        "bachelor of technology bachelor of engineering bachelor of science master of science "
+        "master of technology mba phd gpa cgpa percentage graduated graduation degree "
+        "intern internship trainee junior senior lead principal manager engineer developer "
+        "software engineer data scientist analyst consultant architect full stack backend frontend "
+        "designed developed implemented built maintained improved optimized reduced increased "
+        "managed led mentored collaborated delivered deployed automated migrated integrated "
+        "responsible for working on worked with using including such as across multiple "
+        "performance scalability reliability customers clients stakeholders requirements "
+        "projects project description role responsibilities technologies tools environment "
+        "python java javascript typescript c++ c# sql mysql postgresql mongodb redis "
+        "html css react angular vue nodejs express django flask spring rest api microservices "
+        "aws azure gcp docker kubernetes jenkins terraform linux git github ci/cd agile scrum "
+        "machine learning deep learning tensorflow pytorch pandas numpy scikit-learn nlp "
+        "phone email linkedin github.com linkedin.com/in/ @gmail.com "
+        "professional experience work experience technical skills education skills projects "
+        "years of experience experience in the and of to for with in on a "
+    ).encode('utf-8')
+    
+    def load_dialect_impl(self, dialect):
+        # SQLite keeps the existing TEXT column, which holds blobs just as well
+        if dialect.name == 'sqlite':
+            return dialect.type_descriptor(db.Text())
+        return dialect.type_descriptor(db.LargeBinary())
+    
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        compressor = zlib.compressobj(6, zlib.DEFLATED, -15, zdict=self.DICTIONARY)
+        return bytes([self.FORMAT]) + compressor.compress(value.encode('utf-8')) + compressor.flush()
+    
+    def process_result_value(self, value, dialect):
+        if value is None or isinstance(value, str):
+            return value
+        
+        value = bytes(value)
+        if value[0] != self.FORMAT:
+            raise ValueError(f"Unknown compressed text format {value[0]}")
+        
+        decompressor = zlib.decompressobj(-15, zdict=self.DICTIONARY)
+        return (decompressor.decompress(value[1:]) + decompressor.flush()).decode('utf-8')
+
 class User(UserMixin, db.Model):
     id = db.Column(db.Integer, primary_key=True)
     username = db.Column(db.String(80), unique=True, nullable=False)
     email = db.Column(db.String(120), unique=True, nullable=True)
     password = db.Column(db.String(200), nullable=False)
     is_admin = db.Column(db.Boolean, default=False)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
     
     resumes = db.relationship('Resume', backref='user', lazy=True, cascade='all, delete-orphan')
 
@@ -53,16 +229,31 @@ class Resume(db.Model):
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     filename = db.Column(db.String(200), nullable=False)
     original_name = db.Column(db.String(200))
-    extracted_text = db.Column(db.Text)
+    content_hash = db.Column(db.String(64), index=True)
+    # Large and only needed for matching, so list views never load it
+    extracted_text = db.deferred(db.Column(CompressedText))
     skills = db.Column(db.Text)
+    # Precomputed matching features, see ResumeFeatures
+    features = db.deferred(db.Column(db.LargeBinary))
+    features_version = db.Column(db.String(16))
+    # Best jobs just below the stored top-K matches, see BatchMatcher.pack_runner_ups
+    runner_ups = db.deferred(db.Column(db.LargeBinary))
     experience_years = db.Column(db.Integer, default=0)
     education = db.Column(db.String(200))
     email = db.Column(db.String(120))
     phone = db.Column(db.String(20))
     score = db.Column(db.Integer, default=0)
-    uploaded_at = db.Column(db.DateTime, default=datetime.utcnow)
+    status = db.Column(db.String(20), default='done', server_default='done')
+    parse_error = db.Column(db.String(200))
+    parse_started_at = db.Column(db.DateTime)
+    uploaded_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
     
     matches = db.relationship('Match', backref='resume', lazy=True, cascade='all, delete-orphan')
+    
+    __table_args__ = (
+        db.Index('ix_resume_user_id_uploaded_at', 'user_id', 'uploaded_at'),
+        db.Index('ix_resume_status_id', 'status', 'id'),
+    )
 
 class Job(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -74,22 +265,287 @@ class Job(db.Model):
     location = db.Column(db.String(100))
     salary = db.Column(db.String(50))
     job_type = db.Column(db.String(50), default='Full-time')
-    posted_date = db.Column(db.DateTime, default=datetime.utcnow)
+    posted_date = db.Column(db.DateTime, default=datetime.utcnow, index=True)
     is_active = db.Column(db.Boolean, default=True)
     
     matches = db.relationship('Match', backref='job', lazy=True, cascade='all, delete-orphan')
+    
+    __table_args__ = (
+        db.Index('ix_job_is_active_posted_date', 'is_active', 'posted_date'),
+    )
 
 class Match(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     resume_id = db.Column(db.Integer, db.ForeignKey('resume.id'), nullable=False)
-    job_id = db.Column(db.Integer, db.ForeignKey('job.id'), nullable=False)
+    job_id = db.Column(db.Integer, db.ForeignKey('job.id'), nullable=False, index=True)
     match_score = db.Column(db.Float, default=0.0)
+    # JSON lists from before skill_mask, compress_db.py converts them
     matching_skills = db.Column(db.Text)
     missing_skills = db.Column(db.Text)
+    # Matched Skill ids, as a bitset or a sparse list, see pack_skill_mask
+    skill_mask = db.Column(db.LargeBinary)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    __table_args__ = (
+        db.Index('ix_match_resume_id_match_score', 'resume_id', db.desc('match_score')),
+    )
+    
+    # Skill ids start at 1, so a bitset's first byte is even and this tag is free
+    SPARSE_SKILLS = 0x01
+    
+    @classmethod
+    def pack_skill_mask(cls, matching):
+        """Encode the matched skill names by their stable Skill ids.
+        
+        A bitset grows with the largest skill id, so when it is smaller the
+        ids are stored instead as a tag byte and varint-encoded deltas.
+        """
+        return cls.pack_skill_ids(SkillStore.ids_for(matching).values())
+    
+    @classmethod
+    def pack_skill_ids(cls, skill_ids):
+        mask = 0
+        sparse = bytearray([cls.SPARSE_SKILLS])
+        previous = 0
+        for skill_id in sorted(skill_ids):
+            mask |= 1 << skill_id
+            delta = skill_id - previous
+            previous = skill_id
+            while delta >= 0x80:
+                sparse.append(delta & 0x7f | 0x80)
+                delta >>= 7
+            sparse.append(delta)
+        
+        bitset = mask.to_bytes((mask.bit_length() + 7) // 8 or 1, 'little')
+        return bytes(sparse) if len(sparse) < len(bitset) else bitset
+    
+    @classmethod
+    def unpack_skill_ids(cls, blob):
+        """Skill ids of a pack_skill_ids value, in ascending order"""
+        if blob[0] != cls.SPARSE_SKILLS:
+            mask = int.from_bytes(blob, 'little')
+            skill_ids = []
+            while mask:
+                lowest = mask & -mask
+                skill_ids.append(lowest.bit_length() - 1)
+                mask ^= lowest
+            return skill_ids
+        
+        skill_ids = []
+        skill_id = delta = shift = 0
+        for byte in blob[1:]:
+            delta |= (byte & 0x7f) << shift
+            shift += 7
+            if not byte & 0x80:
+                skill_id += delta
+                skill_ids.append(skill_id)
+                delta = shift = 0
+        return skill_ids
+    
+    def skill_lists(self):
+        """Return the (matching, missing) skill lists of this match.
+        
+        Missing skills come from the job's current skills, so a skill added
+        to the job after scoring shows up as missing until the next rematch
+        and a removed one drops out of both lists.
+        """
+        if self.skill_mask is None:
+            return json.loads(self.matching_skills or '[]'), json.loads(self.missing_skills or '[]')
+        
+        matched = set(SkillStore.names_for(self.unpack_skill_ids(self.skill_mask)).values())
+        matching, missing = [], []
+        for skill in sorted(JobMatcher.job_skill_set(self.job.skills_required)):
+            (matching if skill in matched else missing).append(skill)
+        return matching, missing
+
+class Skill(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), unique=True, nullable=False)
+
+class ResumeSkill(db.Model):
+    resume_id = db.Column(db.Integer, db.ForeignKey('resume.id'), primary_key=True)
+    skill_id = db.Column(db.Integer, db.ForeignKey('skill.id'), primary_key=True)
+    
+    __table_args__ = (
+        db.Index('ix_resume_skill_skill_id_resume_id', 'skill_id', 'resume_id'),
+    )
+
+class JobSkill(db.Model):
+    job_id = db.Column(db.Integer, db.ForeignKey('job.id'), primary_key=True)
+    skill_id = db.Column(db.Integer, db.ForeignKey('skill.id'), primary_key=True)
+    
+    __table_args__ = (
+        db.Index('ix_job_skill_skill_id_job_id', 'skill_id', 'job_id'),
+    )
 
 # ========== HELPER CLASSES ========== #
 
+class Metrics:
+    """Process-local latency histograms in the Prometheus text format.
+    
+    observe() is a bisect and a few additions under a lock, cheap enough to
+    leave on under load. Inside a request the time is also added to the
+    request's per-stage totals, which end up in the request log line.
+    Parse workers run in other processes, so they drain() their histograms
+    back with every result and the web process merge()s them.
+    """
+    
+    BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+    
+    HELP = {
+        'http_request_seconds': 'Time spent handling HTTP requests',
+        'resume_parse_seconds': 'Time spent in each ResumeParser stage',
+        'job_match_seconds': 'Time spent in each job matching component',
+        'upload_seconds': 'Time spent storing uploads and committing resumes',
+        'db_query_seconds': 'Time spent executing SQL statements'
+    }
+    
+    def __init__(self):
+        self.lock = threading.Lock()
+        # (name, labels) -> [count per bucket..., +Inf count, sum]
+        self.series = {}
+    
+    def observe(self, name, seconds, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            series = self.series.get(key)
+            if series is None:
+                series = self.series[key] = [0] * (len(self.BUCKETS) + 1) + [0.0]
+            series[bisect.bisect_left(self.BUCKETS, seconds)] += 1
+            series[-1] += seconds
+        
+        if has_request_context():
+            stage = name[:-len('_seconds')] + ''.join('.' + str(value) for value in labels.values())
+            stages = g.setdefault('stages', {})
+            stages[stage] = stages.get(stage, 0.0) + seconds
+    
+    @contextmanager
+    def timer(self, name, **labels):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, **labels)
+    
+    def drain(self):
+        """Return and reset this process's histograms"""
+        with self.lock:
+            series, self.series = self.series, {}
+        return series
+    
+    def merge(self, series):
+        with self.lock:
+            for key, values in series.items():
+                current = self.series.setdefault(key, [0] * (len(values) - 1) + [0.0])
+                for i, value in enumerate(values):
+                    current[i] += value
+    
+    def render(self):
+        """Format every histogram in the Prometheus text exposition format"""
+        with self.lock:
+            series = {key: list(values) for key, values in self.series.items()}
+        
+        lines = []
+        for name in sorted(set(name for name, labels in series)):
+            lines.append(f"# HELP {name} {self.HELP.get(name, name)}")
+            lines.append(f"# TYPE {name} histogram")
+            
+            for (metric, labels), values in sorted(series.items()):
+                if metric != name:
+                    continue
+                
+                label_text = ','.join(f'{key}="{value}"' for key, value in labels)
+                prefix = label_text + ',' if label_text else ''
+                cumulative = 0
+                for bound, count in zip(self.BUCKETS + ('+Inf',), values):
+                    cumulative += count
+                    lines.append(f'{name}_bucket{{{prefix}le="{bound}"}} {cumulative}')
+                lines.append(f"{name}_sum{{{label_text}}} {values[-1]}")
+                lines.append(f"{name}_count{{{label_text}}} {cumulative}")
+        
+        return '\n'.join(lines) + '\n'
+
+metrics = Metrics()
+
+class SkillMatcher:
+    """Aho-Corasick automaton that finds every known skill in one scan.
+    
+    Patterns are matched on lowercased text and only count when they are
+    not glued to a neighbouring word character, so 'java' does not match
+    inside 'javascript' while punctuated skills like 'c++', 'c#' and
+    'ci/cd' still match. Synonyms map onto their canonical skill name.
+    """
+    
+    WORD_CHARS = frozenset('abcdefghijklmnopqrstuvwxyz0123456789_')
+    
+    def __init__(self, skills, synonyms=None):
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [[]]
+        
+        patterns = {skill.lower(): skill for skill in skills}
+        for alias, skill in (synonyms or {}).items():
+            patterns[alias.lower()] = skill
+        
+        for pattern, skill in patterns.items():
+            self._insert(pattern, skill)
+        self._build_failure_links()
+    
+    def _insert(self, pattern, skill):
+        state = 0
+        for char in pattern:
+            next_state = self.goto[state].get(char)
+            if next_state is None:
+                next_state = len(self.goto)
+                self.goto[state][char] = next_state
+                self.goto.append({})
+                self.fail.append(0)
+                self.output.append([])
+            state = next_state
+        self.output[state].append((len(pattern), skill))
+    
+    def _build_failure_links(self):
+        queue = list(self.goto[0].values())
+        for state in queue:
+            for char, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                target = self.goto[fallback].get(char, 0)
+                self.fail[next_state] = target if target != next_state else 0
+                self.output[next_state] = self.output[next_state] + self.output[self.fail[next_state]]
+    
+    @staticmethod
+    def lowercase(text):
+        """Lowercase text while keeping every offset aligned with the original"""
+        lowered = text.lower()
+        if len(lowered) != len(text):
+            lowered = ''.join(char.lower()[0] for char in text)
+        return lowered
+    
+    def find(self, text, lowered=None):
+        """Yield (skill, start, end) for every skill mention in the text"""
+        if lowered is None:
+            lowered = self.lowercase(text)
+        
+        word_chars = self.WORD_CHARS
+        goto, fail, output = self.goto, self.fail, self.output
+        state = 0
+        
+        for end, char in enumerate(lowered, 1):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            
+            for length, skill in output[state]:
+                start = end - length
+                if start > 0 and lowered[start - 1] in word_chars and lowered[start] in word_chars:
+                    continue
+                if end < len(lowered) and lowered[end] in word_chars and lowered[end - 1] in word_chars:
+                    continue
+                yield skill, start, end
+
 class ResumeParser:
     """Advanced Resume Parser with NLP"""
     
@@ -119,98 +575,181 @@ class ResumeParser:
         'rest api', 'graphql', 'microservices', 'testing'
     ]
     
-    @staticmethod
-    def extract_text_from_pdf(file_path):
-        """Extract text from PDF"""
+    # Alternate spellings mapped onto their SKILLS_DATABASE entry
+    SKILL_SYNONYMS = {
+        'k8s': 'kubernetes',
+        'node.js': 'nodejs',
+        'node js': 'nodejs',
+        'react.js': 'react',
+        'reactjs': 'react',
+        'vue.js': 'vue',
+        'vuejs': 'vue',
+        'angularjs': 'angular',
+        'golang': 'go',
+        'postgres': 'postgresql',
+        'sklearn': 'scikit-learn',
+        'amazon web services': 'aws',
+        'google cloud': 'gcp',
+        'ci-cd': 'ci/cd',
+        'restful api': 'rest api'
+    }
+    
+    _skill_matcher = None
+    
+    # Extraction budget per PDF, so huge or hostile files cannot pin a worker
+    PDF_MAX_PAGES = 50
+    PDF_MAX_CHARS = 100000
+    PDF_TIME_LIMIT = 10
+    
+    # Compiled once at import instead of going through re's cache per call
+    EMAIL_PATTERN = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b')
+    PHONE_PATTERNS = (
+        re.compile(r'\+?\d{1,3}[-.\s]?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}'),
+        re.compile(r'\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}')
+    )
+    # Run on lowercased text
+    EXPERIENCE_PATTERNS = (
+        re.compile(r'(\d+)\+?\s*(?:years?|yrs?)\s+(?:of\s+)?(?:experience|exp)'),
+        re.compile(r'(?:experience|exp).*?(\d+)\+?\s*(?:years?|yrs?)')
+    )
+    
+    # Checked in order, the first degree keyword found decides the level
+    EDUCATION_LEVELS = {
+        'phd': 'PhD',
+        'doctorate': 'PhD',
+        'master': "Master's",
+        'm.tech': "Master's",
+        'mba': 'MBA',
+        'bachelor': "Bachelor's",
+        'b.tech': "Bachelor's",
+        'b.e': "Bachelor's",
+        'b.sc': "Bachelor's"
+    }
+    
+    @classmethod
+    def load_skills(cls, skills, synonyms=None):
+        """Replace the skills taxonomy and rebuild the matcher"""
+        cls.SKILLS_DATABASE = list(skills)
+        cls.SKILL_SYNONYMS = dict(synonyms or {})
+        cls._skill_matcher = None
+    
+    @classmethod
+    def skill_matcher(cls):
+        """Return the precompiled matcher for the current taxonomy"""
+        if cls._skill_matcher is None:
+            cls._skill_matcher = SkillMatcher(cls.SKILLS_DATABASE, cls.SKILL_SYNONYMS)
+        return cls._skill_matcher
+    
+    @classmethod
+    def iter_pdf_pages(cls, file):
+        """Yield page texts lazily until the page, character or time budget runs out"""
+        pdf_reader = PyPDF2.PdfReader(file)
+        deadline = time.monotonic() + cls.PDF_TIME_LIMIT
+        chars = 0
+        
+        for number, page in enumerate(pdf_reader.pages):
+            if number >= cls.PDF_MAX_PAGES or chars >= cls.PDF_MAX_CHARS:
+                break
+            if time.monotonic() > deadline:
+                print(f"PDF Warning: extraction stopped after {number} pages (time limit)")
+                break
+            
+            page_text = page.extract_text() or ""
+            chars += len(page_text)
+            yield page_text
+    
+    @classmethod
+    def extract_text_from_pdf(cls, source):
+        """Extract text from a PDF path or binary file object"""
         try:
-            text = ""
-            with open(file_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                for page in pdf_reader.pages:
-                    text += page.extract_text() or ""
-            return text.strip()
+            if isinstance(source, str):
+                with open(source, 'rb') as file:
+                    text = "\n".join(cls.iter_pdf_pages(file))
+            else:
+                text = "\n".join(cls.iter_pdf_pages(source))
+            return text[:cls.PDF_MAX_CHARS].strip()
         except Exception as e:
             print(f"PDF Error: {e}")
             return ""
     
     @staticmethod
-    def extract_text_from_docx(file_path):
-        """Extract text from DOCX"""
+    def extract_text_from_docx(source):
+        """Extract text from a DOCX path or binary file object"""
         try:
-            doc = Document(file_path)
+            doc = Document(source)
             return "\n".join([para.text for para in doc.paragraphs])
         except Exception as e:
             print(f"DOCX Error: {e}")
             return ""
     
     @classmethod
-    def extract_skills(cls, text):
+    def extract_skill_mentions(cls, text):
+        """Extract every skill mention with its position in the text"""
+        return [
+            {'skill': skill, 'start': start, 'end': end}
+            for skill, start, end in cls.skill_matcher().find(text)
+        ]
+    
+    @classmethod
+    def extract_skills(cls, text, lowered=None):
         """Extract skills from resume text"""
-        text_lower = text.lower()
-        found_skills = []
+        found_skills = {}
         
-        for skill in cls.SKILLS_DATABASE:
-            if re.search(r'\b' + re.escape(skill) + r'\b', text_lower):
-                found_skills.append(skill)
+        for skill, start, end in cls.skill_matcher().find(text, lowered):
+            found_skills.setdefault(skill, start)
         
-        return list(set(found_skills))
+        return list(found_skills)
     
-    @staticmethod
-    def extract_email(text):
+    @classmethod
+    def extract_fields(cls, text, lowered=None):
+        """Extract email, phone, experience and education together.
+        
+        The text is lowercased once and shared by the experience and
+        education scans.
+        """
+        if lowered is None:
+            lowered = SkillMatcher.lowercase(text)
+        
+        return {
+            'email': cls.extract_email(text),
+            'phone': cls.extract_phone(text),
+            'experience_years': cls.extract_experience(text, lowered),
+            'education': cls.extract_education(text, lowered)
+        }
+    
+    @classmethod
+    def extract_email(cls, text):
         """Extract email from text"""
-        pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b'
-        emails = re.findall(pattern, text)
-        return emails[0] if emails else None
+        # First hit only, instead of collecting every match
+        email = cls.EMAIL_PATTERN.search(text)
+        return email.group() if email else None
     
-    @staticmethod
-    def extract_phone(text):
+    @classmethod
+    def extract_phone(cls, text):
         """Extract phone number"""
-        patterns = [
-            r'\+?\d{1,3}[-.\s]?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}',
-            r'\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}'
-        ]
-        for pattern in patterns:
-            phones = re.findall(pattern, text)
-            if phones:
-                return phones[0]
+        for pattern in cls.PHONE_PATTERNS:
+            phone = pattern.search(text)
+            if phone:
+                return phone.group()
         return None
     
-    @staticmethod
-    def extract_experience(text):
+    @classmethod
+    def extract_experience(cls, text, lowered=None):
         """Extract years of experience"""
-        patterns = [
-            r'(\d+)\+?\s*(?:years?|yrs?)\s+(?:of\s+)?(?:experience|exp)',
-            r'(?:experience|exp).*?(\d+)\+?\s*(?:years?|yrs?)'
-        ]
-        
-        years = []
-        for pattern in patterns:
-            matches = re.findall(pattern, text.lower())
-            years.extend([int(m) for m in matches])
-        
+        if lowered is None:
+            lowered = text.lower()
+        years = [int(m) for pattern in cls.EXPERIENCE_PATTERNS for m in pattern.findall(lowered)]
         return max(years) if years else 0
     
-    @staticmethod
-    def extract_education(text):
+    @classmethod
+    def extract_education(cls, text, lowered=None):
         """Extract education level"""
-        education_keywords = {
-            'phd': 'PhD',
-            'doctorate': 'PhD',
-            'master': "Master's",
-            'm.tech': "Master's",
-            'mba': 'MBA',
-            'bachelor': "Bachelor's",
-            'b.tech': "Bachelor's",
-            'b.e': "Bachelor's",
-            'b.sc': "Bachelor's"
-        }
-        
-        text_lower = text.lower()
-        for keyword, level in education_keywords.items():
-            if keyword in text_lower:
-                return level
-        
-        return 'Not specified'
+        if lowered is None:
+            lowered = text.lower()
+        return next(
+            (level for keyword, level in cls.EDUCATION_LEVELS.items() if keyword in lowered),
+            'Not specified'
+        )
     
     @staticmethod
     def calculate_score(skills, experience, education, text):
@@ -242,107 +781,2119 @@ class ResumeParser:
         return min(score, 100)
     
     @classmethod
-    def parse(cls, file_path):
-        """Main parsing function"""
-        if file_path.endswith('.pdf'):
-            text = cls.extract_text_from_pdf(file_path)
-        elif file_path.endswith('.docx'):
-            text = cls.extract_text_from_docx(file_path)
+    def parse(cls, source, extension=None):
+        """Main parsing function.
+        
+        source is a file path, or the file's bytes or a binary file object
+        together with its extension, so uploads can be parsed from memory.
+        """
+        if extension is None:
+            extension = source.rsplit('.', 1)[-1].lower()
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            source = BytesIO(source)
+        
+        if extension == 'pdf':
+            with metrics.timer('resume_parse_seconds', stage='pdf_text'):
+                text = cls.extract_text_from_pdf(source)
+        elif extension == 'docx':
+            with metrics.timer('resume_parse_seconds', stage='docx_text'):
+                text = cls.extract_text_from_docx(source)
         else:
             return None
         
         if not text:
             return None
         
-        skills = cls.extract_skills(text)
-        experience = cls.extract_experience(text)
-        education = cls.extract_education(text)
-        score = cls.calculate_score(skills, experience, education, text)
+        # Lowercase once for both scans
+        lowered = SkillMatcher.lowercase(text)
+        
+        with metrics.timer('resume_parse_seconds', stage='skills'):
+            skills = cls.extract_skills(text, lowered)
+        with metrics.timer('resume_parse_seconds', stage='fields'):
+            fields = cls.extract_fields(text, lowered)
+        score = cls.calculate_score(skills, fields['experience_years'], fields['education'], text)
+        with metrics.timer('resume_parse_seconds', stage='features'):
+            features = ResumeFeatures.encode(ResumeFeatures.compute(skills, text, fields['experience_years']))
         
         return {
             'text': text,
             'skills': skills,
-            'experience_years': experience,
-            'education': education,
-            'email': cls.extract_email(text),
-            'phone': cls.extract_phone(text),
-            'score': score
+            'experience_years': fields['experience_years'],
+            'education': fields['education'],
+            'email': fields['email'],
+            'phone': fields['phone'],
+            'score': score,
+            'features': features,
+            'features_version': ResumeFeatures.version()
         }
+    
+    @classmethod
+    def parse_in_worker(cls, source, extension=None):
+        """Parse in a worker process and hand its stage timings back too"""
+        return cls.parse(source, extension), metrics.drain()
+
+class ResumeFeatures:
+    """Matching features of a resume, computed once and stored on its row.
+    
+    A resume's skills are kept as a bitset over SKILLS_DATABASE, its text as
+    term counts from the shared TF-IDF tokenizer and its experience as a
+    float, so matching never decodes skills JSON or re-tokenizes text. Rows
+    carry the version of the taxonomy and tokenizer they were built with,
+    and stale or missing features are rebuilt on first use.
+    
+    Duplicate uploads store neither text nor features: they read through
+    the row with the same content_hash that holds them.
+    """
+    
+    # Same analyzer as TfidfVectorizer, shared with JobIndex
+    TOKENIZER = TfidfVectorizer(stop_words='english').build_analyzer()
+    # Bump whenever TOKENIZER or the encoding below changes
+    TOKENIZER_VERSION = 1
+    
+    _version = None
+    _version_skills = None
+    
+    @classmethod
+    def version(cls):
+        """Short hash of the tokenizer version and the current taxonomy"""
+        skills = ResumeParser.SKILLS_DATABASE
+        # load_skills swaps in a new list, which invalidates the cached hash
+        if cls._version_skills is not skills:
+            key = json.dumps([cls.TOKENIZER_VERSION, skills])
+            cls._version = hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+            cls._version_skills = skills
+        return cls._version
+    
+    @classmethod
+    def compute(cls, skills, text, experience_years):
+        """Features of a resume from its skill list, text and experience"""
+        return {
+            'skills': set(skill.lower() for skill in skills),
+            'terms': Counter(cls.TOKENIZER(text or "")),
+            'experience': float(experience_years or 0)
+        }
+    
+    @classmethod
+    def encode(cls, features):
+        """Serialize features against the current taxonomy"""
+        positions = {skill: i for i, skill in enumerate(ResumeParser.SKILLS_DATABASE)}
+        mask = 0
+        extra = []
+        for skill in sorted(features['skills']):
+            if skill in positions:
+                mask |= 1 << positions[skill]
+            else:
+                extra.append(skill)
+        
+        payload = json.dumps([mask, extra, features['terms'], features['experience']], separators=(',', ':'))
+        return zlib.compress(payload.encode('utf-8'))
+    
+    @classmethod
+    def decode(cls, blob):
+        """Inverse of encode, for blobs written under the current version"""
+        mask, extra, terms, experience = json.loads(zlib.decompress(blob))
+        names = ResumeParser.SKILLS_DATABASE
+        skills = set(extra)
+        while mask:
+            lowest = mask & -mask
+            skills.add(names[lowest.bit_length() - 1])
+            mask ^= lowest
+        return {'skills': skills, 'terms': terms, 'experience': experience}
+    
+    @staticmethod
+    def holders(resumes):
+        """content_hash -> the row holding the text and features, for resumes that share them"""
+        hashes = {resume.content_hash for resume in resumes if resume.content_hash and resume.features is None}
+        if not hashes:
+            return {}
+        
+        holders = {}
+        for holder in (
+            Resume.query.options(db.undefer(Resume.features))
+            .filter(Resume.content_hash.in_(hashes), Resume.features.isnot(None))
+            .order_by(Resume.id)
+        ):
+            holders.setdefault(holder.content_hash, holder)
+        return holders
+    
+    @classmethod
+    def of_all(cls, resumes):
+        """Features of several resumes, looking up shared ones in one query"""
+        holders = cls.holders(resumes)
+        return [cls.stored(holders.get(resume.content_hash, resume) if resume.features is None else resume) for resume in resumes]
+    
+    @classmethod
+    def of(cls, resume):
+        """Features of one resume, read through the row holding them"""
+        return cls.of_all([resume])[0]
+    
+    @classmethod
+    def stored(cls, resume):
+        """Stored features of a row, rebuilt first if missing or stale"""
+        if resume.features is not None and resume.features_version == cls.version():
+            return cls.decode(resume.features)
+        
+        features = cls.compute(
+            json.loads(resume.skills) if resume.skills else [],
+            resume.extracted_text,
+            resume.experience_years
+        )
+        # Saved with the resume on the caller's next commit
+        resume.features = cls.encode(features)
+        resume.features_version = cls.version()
+        return features
 
 class JobMatcher:
     """Advanced Job Matching Algorithm"""
     
     @staticmethod
-    def calculate_skill_match(resume_skills, job_skills):
-        """Calculate skill matching percentage"""
-        if not job_skills:
-            return 100, [], []
+    def job_skill_set(job_skills):
+        """Normalize a comma-separated skills_required string"""
+        if not job_skills:
+            return set()
+        return set(s.strip().lower() for s in job_skills.split(',') if s.strip())
+    
+    @classmethod
+    def calculate_skill_match(cls, resume_skills, job_skills):
+        """Calculate skill matching percentage"""
+        if not job_skills:
+            return 100, [], []
+        
+        resume_set = set(s.lower() for s in resume_skills)
+        job_set = cls.job_skill_set(job_skills)
+        
+        matching = list(resume_set & job_set)
+        missing = list(job_set - resume_set)
+        
+        match_percentage = (len(matching) / len(job_set)) * 100 if job_set else 0
+        
+        return match_percentage, matching, missing
+    
+    @staticmethod
+    def term_similarity(resume_terms, job_terms):
+        """Cosine similarity * 100 of two texts' term counts, TF-IDF weighted over just the pair"""
+        # Smoothed two-document IDF: shared terms weigh 1, the rest ln(3/2) + 1
+        unique_idf = np.log(1.5) + 1
+        dot = sum(count * job_terms[term] for term, count in resume_terms.items() if term in job_terms)
+        resume_norm = sum((count * (1 if term in job_terms else unique_idf)) ** 2 for term, count in resume_terms.items())
+        job_norm = sum((count * (1 if term in resume_terms else unique_idf)) ** 2 for term, count in job_terms.items())
+        if not dot:
+            return 0
+        return dot / np.sqrt(resume_norm * job_norm) * 100
+    
+    @staticmethod
+    def calculate_experience_match(resume_exp, required_exp):
+        """Calculate experience match"""
+        if required_exp == 0:
+            return 100
+        return min((resume_exp / required_exp) * 100, 100) if resume_exp else 0
+    
+    @classmethod
+    def match(cls, resume, job, text_sim=None):
+        """Calculate overall match score"""
+        with metrics.timer('job_match_seconds', matcher='pairwise', stage='features'):
+            features = ResumeFeatures.of(resume)
+        
+        with metrics.timer('job_match_seconds', matcher='pairwise', stage='skills'):
+            skill_match, matching, missing = cls.calculate_skill_match(
+                features['skills'],
+                job.skills_required or ""
+            )
+        
+        # Pairwise TF-IDF unless the caller already scored against the job index
+        if text_sim is None:
+            with metrics.timer('job_match_seconds', matcher='pairwise', stage='text_similarity'):
+                text_sim = cls.term_similarity(
+                    features['terms'],
+                    Counter(ResumeFeatures.TOKENIZER(job.description or ""))
+                )
+        
+        with metrics.timer('job_match_seconds', matcher='pairwise', stage='experience'):
+            exp_match = cls.calculate_experience_match(
+                features['experience'],
+                job.experience_required or 0
+            )
+        
+        overall = (skill_match * 0.5) + (text_sim * 0.3) + (exp_match * 0.2)
+        
+        return {
+            'score': round(overall, 1),
+            'matching_skills': matching,
+            'missing_skills': missing
+        }
+
+class MatrixStore:
+    """Generations of NumPy arrays on disk, opened read-only with mmap.
+    
+    A generation is a directory of .npy files that is never modified once
+    written. The CURRENT file names the live generation and is replaced
+    atomically, so readers see either the old arrays or the new ones, and
+    every process mapping a generation shares its pages through the OS
+    page cache.
+    """
+    
+    # Generations kept on disk: the live one and the one before it
+    KEEP_GENERATIONS = 2
+    
+    def __init__(self, folder):
+        self.folder = folder
+        self.pointer = os.path.join(folder, 'CURRENT')
+    
+    def current(self):
+        """Name of the live generation, or None before the first publish"""
+        try:
+            with open(self.pointer) as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+    
+    def open(self, generation):
+        """Map every array of a generation read-only"""
+        directory = os.path.join(self.folder, generation)
+        return {
+            name[:-4]: np.load(os.path.join(directory, name), mmap_mode='r')
+            for name in os.listdir(directory) if name.endswith('.npy')
+        }
+    
+    def publish(self, arrays):
+        """Write arrays as a new generation and make it the live one"""
+        os.makedirs(self.folder, exist_ok=True)
+        staging = tempfile.mkdtemp(dir=self.folder, prefix='.staging-')
+        for name, matrix in arrays.items():
+            np.save(os.path.join(staging, name + '.npy'), matrix)
+        
+        generation = f"gen-{time.time_ns():016x}-{os.getpid()}"
+        os.rename(staging, os.path.join(self.folder, generation))
+        
+        fd, tmp_path = tempfile.mkstemp(dir=self.folder, prefix='.CURRENT-')
+        with os.fdopen(fd, 'w') as out:
+            out.write(generation)
+        os.replace(tmp_path, self.pointer)
+        
+        self.prune()
+        return generation
+    
+    def prune(self):
+        """Delete generations older than the ones kept.
+        
+        Processes still mapping a deleted generation keep reading it until
+        they switch, the OS frees the pages after the last unmap.
+        """
+        generations = sorted(name for name in os.listdir(self.folder) if name.startswith('gen-'))
+        for name in generations[:-self.KEEP_GENERATIONS]:
+            shutil.rmtree(os.path.join(self.folder, name), ignore_errors=True)
+    
+    @contextmanager
+    def lock(self):
+        """Serialize writers across processes (no-op where fcntl is missing)"""
+        os.makedirs(self.folder, exist_ok=True)
+        with open(os.path.join(self.folder, 'LOCK'), 'a') as f:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            yield
+
+class JobIndex:
+    """TF-IDF index over the descriptions of all active jobs.
+    
+    The index is a handful of NumPy arrays: job ids, the sorted vocabulary,
+    the IDF weights and one CSR structure holding both the raw term counts
+    and the L2-normalized TF-IDF weights. Added and removed jobs are queued
+    and merged in on the next lookup, so only those jobs are tokenized, and
+    a resume is then scored against every job with a single sparse matrix
+    product.
+    
+    The shared index lives in a MatrixStore under INDEX_FOLDER. Each merge
+    publishes a new generation and every process maps the live one, so
+    workers share a single copy of the matrix, start without rebuilding it
+    and pick up each other's changes on their next lookup.
+    """
+    
+    # Tries at mapping the live generation before giving up
+    OPEN_ATTEMPTS = 3
+    
+    def __init__(self, shared=False):
+        self.analyzer = ResumeFeatures.TOKENIZER
+        self.shared = shared
+        self.lock = threading.RLock()
+        self.pending = {}
+        self.arrays = self.empty_arrays()
+        self.generation = None
+        self.loaded = False
+        # Bumped whenever the arrays change, so derived structures know to rebuild
+        self.revision = 0
+        self._matrix = None
+        self._semantic = None
+    
+    @staticmethod
+    def empty_arrays():
+        return {
+            'job_ids': np.zeros(0, dtype=np.int64),
+            'vocabulary': np.zeros(0, dtype='S1'),
+            'idf': np.zeros(0),
+            'indptr': np.zeros(1, dtype=np.int32),
+            'indices': np.zeros(0, dtype=np.int32),
+            'counts': np.zeros(0, dtype=np.int32),
+            'weights': np.zeros(0)
+        }
+    
+    def store(self):
+        """MatrixStore behind a shared index, or None to stay in process memory"""
+        folder = app.config['INDEX_FOLDER'] if self.shared else None
+        return MatrixStore(folder) if folder else None
+    
+    def ensure_loaded(self):
+        """Reconcile the index with the active jobs the first time this process uses it"""
+        if self.loaded:
+            return
+        
+        with self.lock:
+            self._refresh()
+            active = {job_id for (job_id,) in db.session.query(Job.id).filter_by(is_active=True)}
+            indexed = set(self.arrays['job_ids'].tolist())
+            
+            for job_id in indexed - active:
+                self.remove(job_id)
+            missing = list(active - indexed)
+            for start in range(0, len(missing), 500):
+                for job in Job.query.filter(Job.id.in_(missing[start:start + 500])):
+                    self.add(job)
+            
+            self.flush()
+            self.loaded = True
+    
+    def add(self, job):
+        """Queue a single job to be added (or refreshed) in the index"""
+        counts = Counter(self.analyzer(job.description or ""))
+        with self.lock:
+            self.pending[job.id] = counts
+    
+    def remove(self, job_id):
+        """Queue a job to be dropped from the index"""
+        with self.lock:
+            self.pending[job_id] = None
+    
+    def sync(self, jobs):
+        """Make the index cover exactly the given active jobs"""
+        active = {job.id: job for job in jobs}
+        with self.lock:
+            self._current()
+            indexed = set(self.arrays['job_ids'].tolist())
+            
+            for job_id in indexed - set(active):
+                self.remove(job_id)
+            for job_id in set(active) - indexed:
+                self.add(active[job_id])
+    
+    def flush(self):
+        """Merge queued jobs now instead of on the next lookup"""
+        with self.lock:
+            self._current()
+    
+    def __contains__(self, job_id):
+        with self.lock:
+            if job_id in self.pending:
+                return self.pending[job_id] is not None
+            job_ids = self.arrays['job_ids']
+            row = np.searchsorted(job_ids, job_id)
+            return bool(row < len(job_ids) and job_ids[row] == job_id)
+    
+    def _refresh(self):
+        """Map the live generation if another process published a newer one"""
+        store = self.store()
+        if store is None:
+            return
+        
+        for attempt in range(self.OPEN_ATTEMPTS):
+            generation = store.current()
+            if generation == self.generation:
+                return
+            try:
+                arrays = store.open(generation) if generation else self.empty_arrays()
+                break
+            except FileNotFoundError:
+                # Pruned between reading CURRENT and mapping it, so CURRENT
+                # names a newer generation by now
+                if attempt == self.OPEN_ATTEMPTS - 1:
+                    raise
+        
+        self.arrays = arrays
+        self.generation = generation
+        self.revision += 1
+        self._matrix = None
+    
+    def _current(self):
+        """Bring the arrays up to date with other processes and queued jobs"""
+        self._refresh()
+        if not self.pending:
+            return
+        
+        store = self.store()
+        if store is None:
+            self.arrays = self._merged()
+        else:
+            with store.lock():
+                # Merge into the newest generation so concurrent writers keep each other's jobs
+                self._refresh()
+                self.generation = store.publish(self._merged())
+                self.arrays = store.open(self.generation)
+        
+        self.pending = {}
+        self.revision += 1
+        self._matrix = None
+    
+    def _merged(self):
+        """The arrays with the queued jobs applied, carrying the semantic fit along"""
+        merged = self.merge(self.arrays, self.pending)
+        merged.update(SemanticIndex.carry(self.arrays, merged, self.pending))
+        return merged
+    
+    def install_fit(self, model):
+        """Attach a semantic fit made from an earlier snapshot to the live arrays.
+        
+        Skipped when the live fit is no longer stale, i.e. another process
+        installed a fit of its own in the meantime.
+        """
+        with self.lock:
+            store = self.store()
+            if store is None:
+                if not SemanticIndex.stale(self.arrays):
+                    return
+                self.arrays = SemanticIndex.attach(model, self.arrays)
+            else:
+                with store.lock():
+                    self._refresh()
+                    if not SemanticIndex.stale(self.arrays):
+                        return
+                    self.generation = store.publish(SemanticIndex.attach(model, self.arrays))
+                    self.arrays = store.open(self.generation)
+            
+            self.revision += 1
+            self._matrix = None
+    
+    @staticmethod
+    def merge(arrays, pending):
+        """Index arrays with the queued {job_id: term counts or None} applied"""
+        job_ids = np.asarray(arrays['job_ids'])
+        indptr = np.asarray(arrays['indptr'])
+        row_lengths = np.diff(indptr)
+        
+        # Entries of the rows that stay as they are
+        keep = ~np.isin(job_ids, np.array(list(pending), dtype=np.int64))
+        kept_entries = np.repeat(keep, row_lengths)
+        old_rows = (np.cumsum(keep) - 1)[np.repeat(np.arange(len(job_ids)), row_lengths)[kept_entries]]
+        old_terms = np.asarray(arrays['vocabulary'])[np.asarray(arrays['indices'])[kept_entries]]
+        old_counts = np.asarray(arrays['counts'])[kept_entries]
+        
+        added = {job_id: counts for job_id, counts in pending.items() if counts is not None}
+        new_rows = np.repeat(np.arange(len(added)) + keep.sum(), [len(counts) for counts in added.values()])
+        new_terms = np.array([term.encode('utf-8') for counts in added.values() for term in counts], dtype='S')
+        new_counts = np.array([count for counts in added.values() for count in counts.values()], dtype=np.int32)
+        
+        job_ids = np.concatenate([job_ids[keep], np.array(list(added), dtype=np.int64)])
+        terms = np.concatenate([old_terms, new_terms])
+        # Sorted, so terms are looked up with a binary search; unused terms drop out
+        vocabulary, cols = np.unique(terms, return_inverse=True)
+        order = np.argsort(job_ids, kind='stable')
+        rows = np.argsort(order)[np.concatenate([old_rows, new_rows]).astype(np.int64)]
+        
+        counts = csr_matrix(
+            (np.concatenate([old_counts, new_counts]), (rows, cols.ravel())),
+            shape=(len(job_ids), len(vocabulary))
+        )
+        counts.sort_indices()
+        
+        # Same smoothed IDF and L2 normalization as TfidfVectorizer
+        doc_freq = np.bincount(counts.indices, minlength=len(vocabulary))
+        idf = np.log((1 + len(job_ids)) / (1 + doc_freq)) + 1
+        entry_rows = np.repeat(np.arange(len(job_ids)), np.diff(counts.indptr))
+        weights = counts.data * idf[counts.indices]
+        norms = np.sqrt(np.bincount(entry_rows, weights=weights ** 2, minlength=len(job_ids)))
+        
+        return {
+            'job_ids': job_ids[order],
+            'vocabulary': vocabulary if len(vocabulary) else np.zeros(0, dtype='S1'),
+            'idf': idf,
+            'indptr': counts.indptr,
+            'indices': counts.indices,
+            'counts': counts.data.astype(np.int32),
+            'weights': weights / norms[entry_rows]
+        }
+    
+    @staticmethod
+    def matrix_of(arrays):
+        """The TF-IDF matrix of index arrays as a CSR view over them"""
+        return csr_matrix(
+            (arrays['weights'], arrays['indices'], arrays['indptr']),
+            shape=(len(arrays['job_ids']), len(arrays['vocabulary']))
+        )
+    
+    def _weights(self):
+        """The TF-IDF matrix as a CSR view over the (possibly mapped) arrays"""
+        if self._matrix is None:
+            self._matrix = self.matrix_of(self.arrays)
+        return self._matrix
+    
+    def _vectorize(self, term_counts):
+        """Turn per-text term counts into L2-normalized TF-IDF rows over the job vocabulary"""
+        vocabulary = self.arrays['vocabulary']
+        if not len(vocabulary):
+            return csr_matrix((len(term_counts), 0))
+        
+        rows = np.repeat(np.arange(len(term_counts)), [len(counts) for counts in term_counts])
+        terms = np.array([term.encode('utf-8') for counts in term_counts for term in counts], dtype='S')
+        counts = np.array([count for counts in term_counts for count in counts.values()], dtype=np.float64)
+        
+        cols = np.minimum(np.searchsorted(vocabulary, terms), len(vocabulary) - 1)
+        known = vocabulary[cols] == terms
+        # Terms that no job uses get the IDF of a zero-frequency term
+        unseen_idf = np.log(1 + len(self.arrays['job_ids'])) + 1
+        weights = counts * np.where(known, self.arrays['idf'][cols], unseen_idf)
+        norms = np.sqrt(np.bincount(rows, weights=weights ** 2, minlength=len(term_counts)))
+        
+        return csr_matrix(
+            (weights[known] / norms[rows[known]], (rows[known], cols[known])),
+            shape=(len(term_counts), len(vocabulary))
+        )
+    
+    def similarity_matrix(self, term_counts, job_ids, candidates=None):
+        """Return a (texts x job_ids) array of cosine similarities * 100.
+        
+        Texts come as their term counts, e.g. ResumeFeatures 'terms'. With
+        candidates (one array of job_ids positions per text) only those
+        cells are computed and the rest stay 0.
+        """
+        with self.lock:
+            self._current()
+            
+            scores = np.zeros((len(term_counts), len(job_ids)))
+            indexed = self.arrays['job_ids']
+            requested = np.array(job_ids, dtype=np.int64)
+            rows = np.minimum(np.searchsorted(indexed, requested), max(len(indexed) - 1, 0))
+            found = indexed[rows] == requested if len(indexed) else np.zeros(len(job_ids), dtype=bool)
+            
+            if not found.any() or not term_counts:
+                return scores
+            
+            if candidates is None:
+                product = (self._vectorize(term_counts) @ self._weights().T).toarray() * 100
+                scores[:, found] = product[:, rows[found]]
+            else:
+                vectors = self._vectorize(term_counts)
+                weights = self._weights()
+                for i, columns in enumerate(candidates):
+                    columns = columns[found[columns]]
+                    if len(columns):
+                        scores[i, columns] = (vectors[i] @ weights[rows[columns]].T).toarray()[0] * 100
+            
+            return scores
+    
+    def semantic(self):
+        """The SemanticIndex over this index, created on first use"""
+        with self.lock:
+            if self._semantic is None:
+                self._semantic = SemanticIndex(self)
+            return self._semantic
+    
+    def nearest(self, term_counts, count):
+        """Approximate top-count job ids per text via the SemanticIndex, or None"""
+        with self.lock:
+            self._current()
+            return self.semantic().search(term_counts, count)
+
+job_index = JobIndex(shared=True)
+
+class SemanticIndex:
+    """Approximate nearest-neighbour retrieval of jobs in an LSA space.
+    
+    The TF-IDF rows of a JobIndex are reduced with TruncatedSVD and
+    L2-normalized, then split into inverted lists around k-means centroids
+    (IVF). A resume is projected the same way and only the jobs in its
+    closest lists are compared, so retrieval touches a fraction of the
+    board instead of every job.
+    
+    The fit is stored as lsa_* arrays next to the TF-IDF matrix, so a
+    shared index publishes it in the same MatrixStore generation and every
+    process searches the same lists. Merges project added jobs with the
+    existing components and file them under their nearest centroid, while
+    removed jobs drop out. Fitting takes seconds on a large board, so it
+    never runs inside a lookup: once SEMANTIC_REFIT_FRACTION of the jobs
+    changed, a background thread refits while searches keep using the
+    previous fit, and BatchMatcher.rematch_all refits before a full run.
+    """
+    
+    # Arrays that describe the fit itself rather than the indexed jobs
+    MODEL = ('lsa_vocabulary', 'lsa_components', 'lsa_centroids', 'lsa_fitted_jobs', 'lsa_changed_jobs')
+    
+    def __init__(self, index):
+        self.index = index
+        self.refitting = False
+        # Maps the index vocabulary onto the fit's, rebuilt when the index changes
+        self.revision = None
+        self.selection = None
+    
+    @staticmethod
+    def fitted(arrays):
+        return 'lsa_components' in arrays
+    
+    @staticmethod
+    def stale(arrays):
+        """Whether the fit is missing or SEMANTIC_REFIT_FRACTION of the jobs changed since"""
+        if not SemanticIndex.fitted(arrays):
+            return len(arrays['job_ids']) > 1
+        return int(arrays['lsa_changed_jobs']) > app.config['SEMANTIC_REFIT_FRACTION'] * int(arrays['lsa_fitted_jobs'])
+    
+    @staticmethod
+    def fit(arrays):
+        """Fit the LSA projection and the list centroids on index arrays, {} if too small"""
+        weights = JobIndex.matrix_of(arrays)
+        dimensions = min(app.config['SEMANTIC_DIMENSIONS'], weights.shape[0] - 1, weights.shape[1] - 1)
+        if dimensions < 1:
+            return {}
+        
+        components = TruncatedSVD(n_components=dimensions, random_state=0).fit(weights).components_
+        lists = max(int(np.sqrt(weights.shape[0])), 1)
+        kmeans = MiniBatchKMeans(n_clusters=lists, n_init=3, random_state=0).fit(normalize(weights @ components.T))
+        
+        return {
+            'lsa_vocabulary': np.asarray(arrays['vocabulary']),
+            'lsa_components': components,
+            'lsa_centroids': normalize(kmeans.cluster_centers_),
+            'lsa_fitted_jobs': np.array(weights.shape[0], dtype=np.int64),
+            'lsa_changed_jobs': np.array(0, dtype=np.int64)
+        }
+    
+    @staticmethod
+    def selection_of(model, vocabulary):
+        """Sparse (vocabulary x fit vocabulary) matrix mapping each term onto the fit's column"""
+        fit_vocabulary = model['lsa_vocabulary']
+        cols = np.minimum(np.searchsorted(fit_vocabulary, vocabulary), max(len(fit_vocabulary) - 1, 0))
+        # Terms the fit never saw have no component and drop out
+        known = np.flatnonzero(fit_vocabulary[cols] == vocabulary) if len(fit_vocabulary) else np.zeros(0, dtype=np.int64)
+        return csr_matrix(
+            (np.ones(len(known)), (known, cols[known])),
+            shape=(len(vocabulary), len(fit_vocabulary))
+        )
+    
+    @staticmethod
+    def project(model, matrix, selection):
+        """L2-normalized LSA vectors of TF-IDF rows, selection as from selection_of"""
+        return normalize((matrix @ selection) @ model['lsa_components'].T)
+    
+    @classmethod
+    def assign(cls, model, arrays, rows):
+        """LSA vectors and nearest lists of the given rows of index arrays"""
+        vectors = cls.project(model, JobIndex.matrix_of(arrays)[rows], cls.selection_of(model, arrays['vocabulary']))
+        return vectors.astype(np.float32), np.argmax(vectors @ model['lsa_centroids'].T, axis=1)
+    
+    @staticmethod
+    def lists(model, vectors, labels):
+        """The fit arrays for jobs with these vectors and list labels"""
+        return dict(
+            {key: model[key] for key in SemanticIndex.MODEL},
+            lsa_vectors=vectors,
+            # Rows of each list stored back to back, list l spans offsets[l]:offsets[l + 1]
+            lsa_list_rows=np.argsort(labels, kind='stable'),
+            lsa_offsets=np.concatenate([[0], np.cumsum(np.bincount(labels, minlength=len(model['lsa_centroids'])))]),
+            lsa_labels=labels
+        )
+    
+    @classmethod
+    def attach(cls, model, arrays):
+        """Index arrays with a new fit covering every one of their jobs"""
+        vectors, labels = cls.assign(model, arrays, np.arange(len(arrays['job_ids'])))
+        return dict({key: arrays[key] for key in JobIndex.empty_arrays()}, **cls.lists(model, vectors, labels))
+    
+    @classmethod
+    def carry(cls, old, new, pending):
+        """The fit of old index arrays moved onto the arrays merged from them, {} without one"""
+        if not cls.fitted(old):
+            return {}
+        
+        old_ids, new_ids = np.asarray(old['job_ids']), np.asarray(new['job_ids'])
+        positions = np.minimum(np.searchsorted(old_ids, new_ids), max(len(old_ids) - 1, 0))
+        kept = np.zeros(len(new_ids), dtype=bool)
+        if len(old_ids):
+            kept = (old_ids[positions] == new_ids) & ~np.isin(new_ids, np.array(list(pending), dtype=np.int64))
+        
+        vectors = np.empty((len(new_ids), old['lsa_components'].shape[0]), dtype=np.float32)
+        labels = np.empty(len(new_ids), dtype=np.int64)
+        vectors[kept] = old['lsa_vectors'][positions[kept]]
+        labels[kept] = old['lsa_labels'][positions[kept]]
+        fresh = np.flatnonzero(~kept)
+        if len(fresh):
+            vectors[fresh], labels[fresh] = cls.assign(old, new, fresh)
+        
+        model = {key: old[key] for key in cls.MODEL}
+        model['lsa_changed_jobs'] = np.array(int(old['lsa_changed_jobs']) + len(pending), dtype=np.int64)
+        return cls.lists(model, vectors, labels)
+    
+    def refit(self, background=True):
+        """Fit on the current jobs and install the result in the index.
+        
+        In the background, searches keep using the previous fit until the
+        new one is installed. Does nothing while the fit is fresh or a
+        refit is already running.
+        """
+        with self.index.lock:
+            self.index._current()
+            if self.refitting or not self.stale(self.index.arrays):
+                return
+            self.refitting = True
+            snapshot = self.index.arrays
+        
+        if background:
+            threading.Thread(target=self._refit, args=(snapshot,), daemon=True).start()
+        else:
+            self._refit(snapshot)
+    
+    def _refit(self, snapshot):
+        try:
+            model = self.fit(snapshot)
+            if model:
+                self.index.install_fit(model)
+        except Exception as e:
+            print(f"Semantic Index Error: {e}")
+        finally:
+            self.refitting = False
+    
+    def search(self, term_counts, count):
+        """Ids of roughly the count most similar jobs for each text, or None if unfitted"""
+        arrays = self.index.arrays
+        if self.stale(arrays):
+            self.refit()
+        if not self.fitted(arrays):
+            return None
+        
+        if self.revision != self.index.revision:
+            self.selection = self.selection_of(arrays, arrays['vocabulary'])
+            self.revision = self.index.revision
+        
+        queries = self.project(arrays, self.index._vectorize(term_counts), self.selection)
+        vectors, list_rows, offsets = arrays['lsa_vectors'], arrays['lsa_list_rows'], arrays['lsa_offsets']
+        list_sizes = np.diff(offsets)
+        results = []
+        
+        for query, centroid_scores in zip(queries, queries @ arrays['lsa_centroids'].T):
+            # Probe the closest lists until they hold enough jobs, and at least SEMANTIC_NPROBE of them
+            order = np.argsort(-centroid_scores)
+            probes = max(app.config['SEMANTIC_NPROBE'], np.searchsorted(np.cumsum(list_sizes[order]), count) + 1)
+            rows = np.concatenate([list_rows[offsets[l]:offsets[l + 1]] for l in order[:probes]])
+            
+            if len(rows) > count:
+                similarity = vectors[rows] @ query
+                rows = rows[np.argpartition(-similarity, count - 1)[:count]]
+            results.append(arrays['job_ids'][rows])
+        
+        return results
+
+class SkillStore:
+    """Keeps the normalized skill tables in step with the skill strings.
+    
+    Resume.skills (JSON) and Job.skills_required (comma separated) stay the
+    source of truth. Every insert, update or delete mirrors them into
+    skill / resume_skill / job_skill, so skill lookups become indexed
+    joins instead of decoding strings row by row.
+    """
+    
+    # Skill ids never change once assigned, so each process caches them
+    _ids = {}
+    _names = {}
+    
+    @staticmethod
+    def resume_skill_names(skills):
+        return set(s.strip().lower() for s in json.loads(skills)) if skills else set()
+    
+    @staticmethod
+    def skill_ids(conn, names):
+        """Map skill names to ids, creating missing skills"""
+        table = Skill.__table__
+        names = set(names)
+        if not names:
+            return {}
+        
+        ids = dict(conn.execute(db.select(table.c.name, table.c.id).where(table.c.name.in_(names))).all())
+        missing = names - set(ids)
+        if missing:
+            conn.execute(table.insert(), [{'name': name} for name in missing])
+            ids.update(conn.execute(db.select(table.c.name, table.c.id).where(table.c.name.in_(missing))).all())
+        return ids
+    
+    @classmethod
+    def ids_for(cls, names):
+        """Map skill names to ids through the process cache.
+        
+        Job skills are linked as soon as a job is saved, so every skill a
+        match can report already has a row.
+        """
+        missing = [name for name in names if name not in cls._ids]
+        if missing:
+            for skill_id, name in db.session.query(Skill.id, Skill.name).filter(Skill.name.in_(missing)):
+                cls._ids[name] = skill_id
+                cls._names[skill_id] = name
+        return {name: cls._ids[name] for name in names if name in cls._ids}
+    
+    @classmethod
+    def names_for(cls, ids):
+        """Map skill ids to names through the process cache"""
+        missing = [skill_id for skill_id in ids if skill_id not in cls._names]
+        if missing:
+            for skill_id, name in db.session.query(Skill.id, Skill.name).filter(Skill.id.in_(missing)):
+                cls._ids[name] = skill_id
+                cls._names[skill_id] = name
+        return {skill_id: cls._names[skill_id] for skill_id in ids if skill_id in cls._names}
+    
+    @classmethod
+    def link(cls, conn, link_table, owner_column, owned):
+        """Replace the skill links of each (owner_id, skill names) pair"""
+        if not owned:
+            return
+        
+        ids = cls.skill_ids(conn, {name for owner_id, names in owned for name in names})
+        conn.execute(link_table.delete().where(link_table.c[owner_column].in_([owner_id for owner_id, names in owned])))
+        
+        rows = [{owner_column: owner_id, 'skill_id': ids[name]} for owner_id, names in owned for name in names]
+        if rows:
+            conn.execute(link_table.insert(), rows)
+    
+    @classmethod
+    def link_resumes(cls, conn, owned):
+        cls.link(conn, ResumeSkill.__table__, 'resume_id', [(resume_id, cls.resume_skill_names(skills)) for resume_id, skills in owned])
+    
+    @classmethod
+    def link_jobs(cls, conn, owned):
+        cls.link(conn, JobSkill.__table__, 'job_id', [(job_id, JobMatcher.job_skill_set(skills)) for job_id, skills in owned])
+    
+    @classmethod
+    def backfill(cls, conn, batch_size=1000):
+        """Link every resume and job that has skills but no skill rows yet"""
+        resume, job = Resume.__table__, Job.__table__
+        linked_resumes = db.select(ResumeSkill.__table__.c.resume_id)
+        linked_jobs = db.select(JobSkill.__table__.c.job_id)
+        
+        for table, linked, link in ((resume, linked_resumes, cls.link_resumes), (job, linked_jobs, cls.link_jobs)):
+            skills_column = table.c.skills if table is resume else table.c.skills_required
+            last_id = 0
+            while True:
+                owned = conn.execute(
+                    db.select(table.c.id, skills_column)
+                    .where(table.c.id > last_id, skills_column.isnot(None), table.c.id.notin_(linked))
+                    .order_by(table.c.id)
+                    .limit(batch_size)
+                ).all()
+                if not owned:
+                    break
+                link(conn, owned)
+                last_id = owned[-1][0]
+    
+    @staticmethod
+    def resume_skills(resume_id):
+        """Skill names of one resume"""
+        return [name for (name,) in db.session.query(Skill.name).join(ResumeSkill).filter(ResumeSkill.resume_id == resume_id).order_by(Skill.name)]
+
+@event.listens_for(Resume, 'after_insert')
+@event.listens_for(Resume, 'after_update')
+def sync_resume_skills(mapper, connection, target):
+    if db.inspect(target).attrs.skills.history.has_changes():
+        SkillStore.link_resumes(connection, [(target.id, target.skills)])
+
+@event.listens_for(Job, 'after_insert')
+@event.listens_for(Job, 'after_update')
+def sync_job_skills(mapper, connection, target):
+    if db.inspect(target).attrs.skills_required.history.has_changes():
+        SkillStore.link_jobs(connection, [(target.id, target.skills_required)])
+
+@event.listens_for(Resume, 'before_delete')
+def hand_over_content(mapper, connection, target):
+    """Move the text and features of a deleted row to a duplicate that reads through it"""
+    table = Resume.__table__
+    if not target.content_hash:
+        return
+    
+    holders = connection.execute(
+        db.select(table.c.id).where(table.c.content_hash == target.content_hash, table.c.features.isnot(None))
+    ).scalars().all()
+    if holders != [target.id]:
+        return
+    
+    heir = connection.execute(
+        db.select(table.c.id)
+        .where(table.c.content_hash == target.content_hash, table.c.id != target.id, table.c.status == 'done')
+        .order_by(table.c.id).limit(1)
+    ).scalar()
+    if heir is None:
+        return
+    
+    source = table.alias('source')
+    connection.execute(table.update().where(table.c.id == heir).values({
+        column: db.select(source.c[column]).where(source.c.id == target.id).scalar_subquery()
+        for column in ('extracted_text', 'features', 'features_version')
+    }))
+
+@event.listens_for(Resume, 'after_delete')
+def delete_resume_skills(mapper, connection, target):
+    connection.execute(ResumeSkill.__table__.delete().where(ResumeSkill.__table__.c.resume_id == target.id))
+
+@event.listens_for(Job, 'after_delete')
+def delete_job_skills(mapper, connection, target):
+    connection.execute(JobSkill.__table__.delete().where(JobSkill.__table__.c.job_id == target.id))
+
+class CandidateIndex:
+    """In-memory inverted index from skill name to resume ids.
+    
+    Each posting list is a sorted array of 64-bit resume ids. Ranking the
+    resumes for a job first counts skill overlap across the job's posting
+    lists, so only the best-overlapping resumes reach full scoring. The
+    index is built on first use and kept current on upload and delete.
+    After CANDIDATE_INDEX_MAX_AGE seconds it is rebuilt in the background
+    to pick up writes from other processes, and lookups keep using the
+    current postings until the new ones are swapped in.
+    """
+    
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.rebuilt = threading.Condition(self.lock)
+        self.postings = None
+        self.built_at = 0
+        # (resume_id, skills, added) changes made while a rebuild runs
+        self.changes = None
+    
+    @staticmethod
+    def load():
+        postings = {}
+        rows = (
+            db.session.query(ResumeSkill.resume_id, Skill.name)
+            .join(Skill, Skill.id == ResumeSkill.skill_id)
+            .order_by(ResumeSkill.resume_id)
+        )
+        for resume_id, name in rows:
+            postings.setdefault(name, array('q')).append(resume_id)
+        return postings
+    
+    def rebuild(self, background=True):
+        """Reload the postings from the database.
+        
+        Does nothing while a rebuild is already running, except that a
+        foreground call waits for it to finish.
+        """
+        with self.lock:
+            if self.changes is not None:
+                if not background:
+                    self.rebuilt.wait_for(lambda: self.changes is None)
+                return
+            self.changes = []
+        
+        if background:
+            threading.Thread(target=self._rebuild, daemon=True).start()
+        else:
+            self._rebuild()
+    
+    def _rebuild(self):
+        postings = None
+        try:
+            with app.app_context():
+                postings = self.load()
+        except Exception as e:
+            print(f"Candidate Index Error: {e}")
+        finally:
+            with self.lock:
+                if postings is not None:
+                    # Replay what this process changed while the rows were read
+                    for resume_id, skills, added in self.changes:
+                        self._apply(postings, resume_id, skills, added)
+                    self.postings = postings
+                    self.built_at = time.monotonic()
+                self.changes = None
+                self.rebuilt.notify_all()
+    
+    @staticmethod
+    def _apply(postings, resume_id, skills, added):
+        for skill in skills:
+            posting = postings.setdefault(skill, array('q')) if added else postings.get(skill)
+            if posting is None:
+                continue
+            position = bisect.bisect_left(posting, resume_id)
+            present = position < len(posting) and posting[position] == resume_id
+            if added and not present:
+                posting.insert(position, resume_id)
+            elif not added and present:
+                del posting[position]
+    
+    def _change(self, resume_id, skills, added):
+        with self.lock:
+            if self.changes is not None:
+                self.changes.append((resume_id, skills, added))
+            if self.postings is not None:
+                self._apply(self.postings, resume_id, skills, added)
+    
+    def add(self, resume_id, skills):
+        self._change(resume_id, skills, True)
+    
+    def remove(self, resume_id, skills):
+        self._change(resume_id, skills, False)
+    
+    def candidates(self, skills, limit):
+        """Return [(resume_id, shared skill count)] for the best overlaps"""
+        if self.postings is None:
+            self.rebuild(background=False)
+        elif time.monotonic() - self.built_at > app.config['CANDIDATE_INDEX_MAX_AGE']:
+            self.rebuild()
+        
+        with self.lock:
+            if self.postings is None:
+                return []
+            lists = [np.frombuffer(self.postings[skill], dtype=np.int64) for skill in skills if self.postings.get(skill)]
+        
+        if not lists:
+            return []
+        
+        resume_ids, overlap = np.unique(np.concatenate(lists), return_counts=True)
+        best = np.lexsort((resume_ids, -overlap))[:limit]
+        return list(zip(resume_ids[best].tolist(), overlap[best].tolist()))
+
+candidate_index = CandidateIndex()
+
+class BatchMatcher:
+    """Vectorized scoring of many resumes against all active jobs.
+    
+    Skills become sparse binary matrices, experience becomes NumPy arrays
+    and text goes through the shared job index, so a whole chunk of
+    resumes is scored with a handful of matrix operations using the same
+    weights as JobMatcher.match (skill 0.5 / text 0.3 / experience 0.2).
+    """
+    
+    def __init__(self, jobs, index=None):
+        # The shared index is synced to the full active set; callers
+        # scoring other job sets pass an index of their own
+        if index is None:
+            index = job_index
+            index.sync(jobs)
+        self.index = index
+        
+        self.job_ids = [job.id for job in jobs]
+        self.job_skills = [JobMatcher.job_skill_set(job.skills_required) for job in jobs]
+        self.required_exp = np.array([job.experience_required or 0 for job in jobs], dtype=np.float64)
+        
+        self.skill_ids = {}
+        for skills in self.job_skills:
+            for skill in skills:
+                self.skill_ids.setdefault(skill, len(self.skill_ids))
+        
+        self.job_skill_matrix = self._skill_matrix(self.job_skills)
+        self.job_skill_counts = np.array([len(skills) for skills in self.job_skills], dtype=np.float64)
+    
+    def _skill_matrix(self, skill_sets):
+        """Binary (rows x skills) matrix; skills no job asks for are dropped"""
+        rows, cols = [], []
+        for row, skills in enumerate(skill_sets):
+            for skill in skills:
+                col = self.skill_ids.get(skill)
+                if col is not None:
+                    rows.append(row)
+                    cols.append(col)
+        
+        return csr_matrix((np.ones(len(rows)), (rows, cols)), shape=(len(skill_sets), len(self.skill_ids)))
+    
+    def score(self, resumes):
+        """Return the (resumes x jobs) score matrix and each resume's skill set"""
+        with metrics.timer('job_match_seconds', matcher='batch', stage='features'):
+            features = ResumeFeatures.of_all(resumes)
+        
+        with metrics.timer('job_match_seconds', matcher='batch', stage='skills'):
+            resume_skills = [f['skills'] for f in features]
+            
+            overlap = (self._skill_matrix(resume_skills) @ self.job_skill_matrix.T).toarray()
+            with np.errstate(divide='ignore', invalid='ignore'):
+                skill_match = np.where(self.job_skill_counts > 0, overlap / self.job_skill_counts * 100, 100)
+        
+        terms = [f['terms'] for f in features]
+        candidates = self.semantic_candidates(terms)
+        
+        with metrics.timer('job_match_seconds', matcher='batch', stage='text_similarity'):
+            text_sim = self.index.similarity_matrix(terms, self.job_ids, candidates)
+        
+        resume_exp = np.array([f['experience'] for f in features], dtype=np.float64)[:, None]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            exp_match = np.where(
+                self.required_exp == 0,
+                100,
+                np.where(resume_exp > 0, np.minimum(resume_exp / self.required_exp * 100, 100), 0)
+            )
+        
+        overall = (skill_match * 0.5) + (text_sim * 0.3) + (exp_match * 0.2)
+        
+        if candidates is not None:
+            # Jobs the semantic retrieval passed over are never ranked
+            skipped = np.ones(overall.shape, dtype=bool)
+            for i, columns in enumerate(candidates):
+                skipped[i, columns] = False
+            overall[skipped] = -np.inf
+        
+        return np.round(overall, 1), resume_skills
+    
+    def semantic_candidates(self, term_counts):
+        """Job columns worth exact scoring per resume, or None to score every job.
+        
+        Only in SEMANTIC_MATCHING mode and once there are more active jobs
+        than SEMANTIC_CANDIDATES; skipped cells score -inf.
+        """
+        count = app.config['SEMANTIC_CANDIDATES']
+        if not app.config['SEMANTIC_MATCHING'] or len(self.job_ids) <= count:
+            return None
+        
+        with metrics.timer('job_match_seconds', matcher='batch', stage='retrieval'):
+            nearest = self.index.nearest(term_counts, count)
+        if nearest is None:
+            return None
+        
+        positions = {job_id: col for col, job_id in enumerate(self.job_ids)}
+        return [
+            np.array([positions[job_id] for job_id in job_ids.tolist() if job_id in positions], dtype=np.int64)
+            for job_ids in nearest
+        ]
+    
+    @staticmethod
+    def top_k(scores, k):
+        """Column indices of the k best scores in each row, best first"""
+        if not k or k >= scores.shape[1]:
+            return np.argsort(-scores, axis=1, kind='stable')
+        
+        # Partial sort: only the k winners per row get fully ordered
+        best = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        order = np.argsort(-np.take_along_axis(scores, best, axis=1), axis=1, kind='stable')
+        return np.take_along_axis(best, order, axis=1)
+    
+    def match_details(self, resume_skills, j):
+        """Matching and missing skills for one resume against job column j"""
+        return list(resume_skills & self.job_skills[j]), list(self.job_skills[j] - resume_skills)
+    
+    # (job_id, match_score) entries of Resume.runner_ups, best first
+    RUNNER_UP = np.dtype([('job_id', '<i8'), ('score', '<f8')])
+    
+    @classmethod
+    def pack_runner_ups(cls, entries):
+        return np.array(entries, dtype=cls.RUNNER_UP).tobytes()
+    
+    @classmethod
+    def unpack_runner_ups(cls, blob):
+        """Runner-up (job_id, score) pairs, none for rows saved before they were kept"""
+        if not blob:
+            return []
+        return [(int(job_id), float(score)) for job_id, score in np.frombuffer(blob, dtype=cls.RUNNER_UP)]
+    
+    def save(self, resumes, scores, resume_skills, top_k=None):
+        """Replace the stored matches of these resumes with one bulk insert.
+        
+        Only the top_k best jobs per resume are written (MATCH_TOP_K by
+        default), so rows nobody reads never reach the match table. The
+        next MATCH_RUNNER_UPS jobs are packed into Resume.runner_ups.
+        """
+        if top_k is None:
+            top_k = app.config['MATCH_TOP_K']
+        depth = top_k + app.config['MATCH_RUNNER_UPS'] if top_k else top_k
+        
+        rows = []
+        runner_ups = []
+        for i, columns in enumerate(self.top_k(scores, depth)):
+            columns = columns[np.isfinite(scores[i, columns])]
+            for j in (columns[:top_k] if top_k else columns):
+                rows.append({
+                    'resume_id': resumes[i].id,
+                    'job_id': self.job_ids[j],
+                    'match_score': float(scores[i, j]),
+                    'skill_mask': Match.pack_skill_mask(self.job_skills[j] & resume_skills[i])
+                })
+            runner_ups.append({
+                'id': resumes[i].id,
+                'runner_ups': self.pack_runner_ups([(self.job_ids[j], float(scores[i, j])) for j in columns[top_k:]]) if top_k else None
+            })
+        
+        Match.query.filter(Match.resume_id.in_([resume.id for resume in resumes])).delete(synchronize_session=False)
+        if rows:
+            db.session.execute(db.insert(Match), rows)
+        if runner_ups:
+            db.session.execute(db.update(Resume), runner_ups)
+        db.session.commit()
+    
+    @staticmethod
+    def stored_matches(resume_ids):
+        """resume_id -> [(match_score, job_id, match id)] of the stored matches, best first"""
+        stored = {resume_id: [] for resume_id in resume_ids}
+        for resume_id, score, job_id, match_id in db.session.query(
+            Match.resume_id, Match.match_score, Match.job_id, Match.id
+        ).filter(Match.resume_id.in_(resume_ids)).order_by(Match.resume_id, Match.match_score.desc(), Match.id):
+            stored[resume_id].append((score, job_id, match_id))
+        return stored
+    
+    @classmethod
+    def add_job_matches(cls, job, chunk_size=None):
+        """Merge a new or reactivated job into every matched resume's top-K.
+        
+        Only this one job is scored, so the cost is O(resumes) instead of
+        re-matching every resume against every job. A job that misses the
+        top-K can still land among the runner-ups, and a match it pushes
+        out of the top-K becomes the best runner-up.
+        """
+        chunk_size = chunk_size or app.config['BATCH_MATCH_CHUNK_SIZE']
+        top_k = app.config['MATCH_TOP_K']
+        reserve = app.config['MATCH_RUNNER_UPS']
+        
+        job_index.ensure_loaded()
+        job_index.add(job)
+        matcher = cls([job], index=job_index)
+        # Stored matches plus runner-ups that cover all other jobs have no gaps to fill
+        other_jobs = Job.query.filter(Job.is_active == True, Job.id != job.id).count()
+        
+        matched = db.session.query(Match.resume_id).distinct()
+        last_id = 0
+        
+        while True:
+            chunk = (
+                Resume.query.options(db.undefer(Resume.features), db.undefer(Resume.runner_ups))
+                .filter(Resume.status == 'done', Resume.id > last_id, Resume.id.in_(matched))
+                .order_by(Resume.id).limit(chunk_size).all()
+            )
+            if not chunk:
+                break
+            
+            resume_ids = [resume.id for resume in chunk]
+            scores, resume_skills = matcher.score(chunk)
+            
+            Match.query.filter(Match.job_id == job.id, Match.resume_id.in_(resume_ids)).delete(synchronize_session=False)
+            stored = cls.stored_matches(resume_ids)
+            
+            rows = []
+            dropped = []
+            updates = []
+            for i, resume in enumerate(chunk):
+                score = float(scores[i, 0])
+                if not np.isfinite(score):
+                    continue
+                matches = stored[resume.id]
+                
+                # Below a full top-K every other job is stored already, so this one joins too
+                if top_k and len(matches) >= top_k:
+                    kept = cls.unpack_runner_ups(resume.runner_ups)
+                    runner_ups = [entry for entry in kept if entry[0] != job.id]
+                    
+                    if score > matches[-1][0]:
+                        # The weakest match steps down to become the best runner-up
+                        weakest_score, weakest_job, weakest_id = matches[-1]
+                        dropped.append(weakest_id)
+                        runner_ups.insert(0, (weakest_job, weakest_score))
+                    else:
+                        # Only a job ranking above some kept one, or one where every
+                        # other job is kept, is known to belong right here
+                        if len(matches) + len(runner_ups) >= other_jobs or (runner_ups and score > runner_ups[-1][1]):
+                            runner_ups.append((job.id, score))
+                            runner_ups.sort(key=lambda entry: -entry[1])
+                        if runner_ups != kept:
+                            updates.append({'id': resume.id, 'runner_ups': cls.pack_runner_ups(runner_ups[:reserve])})
+                        continue
+                    
+                    updates.append({'id': resume.id, 'runner_ups': cls.pack_runner_ups(runner_ups[:reserve])})
+                
+                rows.append({
+                    'resume_id': resume.id,
+                    'job_id': job.id,
+                    'match_score': score,
+                    'skill_mask': Match.pack_skill_mask(matcher.job_skills[0] & resume_skills[i])
+                })
+            
+            if dropped:
+                Match.query.filter(Match.id.in_(dropped)).delete(synchronize_session=False)
+            if rows:
+                db.session.execute(db.insert(Match), rows)
+            if updates:
+                db.session.execute(db.update(Resume), updates)
+            db.session.commit()
+            last_id = resume_ids[-1]
+    
+    @classmethod
+    def remove_job_matches(cls, job_id, chunk_size=None):
+        """Drop the stored matches and runner-ups of a deactivated or deleted job.
+        
+        Under MATCH_TOP_K a resume that had this job among its matches
+        promotes its best runner-up into the free slot, so a job edit costs
+        O(resumes). Only resumes whose runner-ups ran out while other
+        active jobs were never kept are re-scored against every job.
+        """
+        chunk_size = chunk_size or app.config['BATCH_MATCH_CHUNK_SIZE']
+        top_k = app.config['MATCH_TOP_K']
+        affected = [resume_id for (resume_id,) in db.session.query(Match.resume_id).filter_by(job_id=job_id)]
+        
+        Match.query.filter_by(job_id=job_id).delete(synchronize_session=False)
+        db.session.commit()
+        if not top_k:
+            return
+        
+        other_jobs = Job.query.filter(Job.is_active == True, Job.id != job_id).count()
+        refill = set(affected)
+        rescore = []
+        last_id = 0
+        
+        while True:
+            chunk = db.session.query(Resume.id, Resume.skills, Resume.runner_ups).filter(
+                Resume.id > last_id, Resume.status == 'done', Resume.runner_ups.isnot(None)
+            ).order_by(Resume.id).limit(chunk_size).all()
+            if not chunk:
+                break
+            last_id = chunk[-1][0]
+            
+            # Runner-ups of every resume drop the job, affected ones also fill their slot
+            touched = {
+                resume_id: (skills, cls.unpack_runner_ups(blob))
+                for resume_id, skills, blob in chunk
+                if resume_id in refill or any(entry[0] == job_id for entry in cls.unpack_runner_ups(blob))
+            }
+            if not touched:
+                continue
+            
+            stored = cls.stored_matches([resume_id for resume_id in touched if resume_id in refill])
+            promoted_jobs = {
+                job.id: JobMatcher.job_skill_set(job.skills_required)
+                for job in Job.query.filter(Job.id.in_({
+                    runner_ups[0][0] for resume_id, (skills, runner_ups) in touched.items() if runner_ups and resume_id in refill
+                }))
+            }
+            
+            rows = []
+            updates = []
+            for resume_id, (skills, runner_ups) in touched.items():
+                runner_ups = [entry for entry in runner_ups if entry[0] != job_id]
+                if resume_id in refill:
+                    refill.discard(resume_id)
+                    if runner_ups:
+                        promoted_job, score = runner_ups.pop(0)
+                        rows.append({
+                            'resume_id': resume_id,
+                            'job_id': promoted_job,
+                            'match_score': score,
+                            'skill_mask': Match.pack_skill_mask(promoted_jobs[promoted_job] & SkillStore.resume_skill_names(skills))
+                        })
+                    elif len(stored[resume_id]) < other_jobs:
+                        rescore.append(resume_id)
+                updates.append({'id': resume_id, 'runner_ups': cls.pack_runner_ups(runner_ups)})
+            
+            if rows:
+                db.session.execute(db.insert(Match), rows)
+            db.session.execute(db.update(Resume), updates)
+            db.session.commit()
+        
+        # Resumes matched before runner-ups were kept have none to promote
+        rescore.extend(refill)
+        if not rescore or not other_jobs:
+            return
+        
+        matcher = cls(Job.query.filter(Job.is_active == True, Job.id != job_id).all())
+        for start in range(0, len(rescore), chunk_size):
+            chunk = (
+                Resume.query.options(db.undefer(Resume.features))
+                .filter(Resume.id.in_(rescore[start:start + chunk_size]), Resume.status == 'done')
+                .all()
+            )
+            if chunk:
+                matcher.save(chunk, *matcher.score(chunk))
+    
+    @classmethod
+    def rematch_all(cls, chunk_size=None):
+        """Re-match every parsed resume in bounded-size chunks"""
+        chunk_size = chunk_size or app.config['BATCH_MATCH_CHUNK_SIZE']
+        jobs = Job.query.filter_by(is_active=True).all()
+        if not jobs:
+            return 0
+        
+        matcher = cls(jobs)
+        if app.config['SEMANTIC_MATCHING']:
+            # A full rematch runs outside any request, so a stale fit is refit here
+            matcher.index.semantic().refit(background=False)
+        last_id = 0
+        total = 0
+        
+        while True:
+            chunk = (
+                Resume.query.options(db.undefer(Resume.features))
+                .filter(Resume.status == 'done', Resume.id > last_id)
+                .order_by(Resume.id).limit(chunk_size).all()
+            )
+            if not chunk:
+                break
+            
+            matcher.save(chunk, *matcher.score(chunk))
+            last_id = chunk[-1].id
+            total += len(chunk)
+            # Keep the session's identity map from growing with every chunk
+            db.session.expunge_all()
+        
+        return total
+
+class ParseQueue:
+    """Background resume parsing backed by the resume table.
+    
+    Uploads are stored as Resume rows with status 'pending' while their
+    bytes wait in a staging file named after their content hash, which
+    every app process can read. A dispatcher thread claims pending rows,
+    hands the staged files to a process pool and writes the results back,
+    so the upload request returns immediately and only files that parse
+    reach the upload store. The queue state lives in the database and the
+    staging folder and needs no external broker, so rows queued by another
+    process or before a restart are parsed like any other.
+    """
+    
+    def __init__(self, app):
+        self.app = app
+        self.lock = threading.Lock()
+        self.wakeup = threading.Event()
+        self.thread = None
+        self.pool = None
+        self.running = {}
+    
+    def start(self):
+        """Start the dispatcher thread if it is not running yet"""
+        # 0 workers parses inside the upload request, there is nothing to dispatch
+        if not self.app.config['PARSE_QUEUE_WORKERS']:
+            return
+        
+        with self.lock:
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(target=self._run, name='parse-queue', daemon=True)
+                self.thread.start()
+    
+    def notify(self):
+        """Tell the dispatcher that new work was queued"""
+        self.start()
+        self.wakeup.set()
+    
+    def is_full(self):
+        return Resume.query.filter(Resume.status.in_(['pending', 'parsing'])).count() >= self.app.config['PARSE_QUEUE_MAX_LENGTH']
+    
+    def _run(self):
+        while True:
+            with self.app.app_context():
+                try:
+                    self._tick()
+                except Exception as e:
+                    db.session.rollback()
+                    print(f"Parse Queue Error: {e}")
+            
+            self.wakeup.wait(self.app.config['PARSE_QUEUE_POLL_INTERVAL'])
+            self.wakeup.clear()
+    
+    def _tick(self):
+        workers = self.app.config['PARSE_QUEUE_WORKERS']
+        if self.pool is None:
+            self.pool = multiprocessing.get_context('spawn').Pool(workers)
+        
+        self._collect()
+        self._requeue_stale()
+        self._fail_lost()
+        self._prune_staging()
+        
+        free = workers - len(self.running)
+        if free <= 0:
+            return
+        
+        sources = {}
+        for resume_id, filename in db.session.query(Resume.id, Resume.filename).filter(
+            Resume.status == 'pending'
+        ).order_by(Resume.id):
+            source = queued_upload_path(filename)
+            if source:
+                sources[resume_id] = source
+                if len(sources) >= free:
+                    break
+        
+        for resume_id, source in sources.items():
+            # Conditional update so only one process claims each row
+            claimed = Resume.query.filter_by(id=resume_id, status='pending').update(
+                {'status': 'parsing', 'parse_started_at': datetime.utcnow()}
+            )
+            db.session.commit()
+            
+            if claimed:
+                result = self.pool.apply_async(ResumeParser.parse_in_worker, (source,))
+                self.running[resume_id] = (result, time.monotonic())
+    
+    def _collect(self):
+        timeout = self.app.config['PARSE_QUEUE_TASK_TIMEOUT']
+        timed_out = []
+        
+        for resume_id, (result, started) in list(self.running.items()):
+            if result.ready():
+                del self.running[resume_id]
+                try:
+                    parsed, worker_metrics = result.get()
+                    metrics.merge(worker_metrics)
+                    finish_parse(resume_id, parsed)
+                except Exception as e:
+                    finish_parse(resume_id, None, str(e))
+            elif time.monotonic() - started > timeout:
+                timed_out.append(resume_id)
+        
+        if timed_out:
+            # A stuck worker can only be stopped by tearing the pool down
+            self.pool.terminate()
+            self.pool = multiprocessing.get_context('spawn').Pool(self.app.config['PARSE_QUEUE_WORKERS'])
+            
+            for resume_id in timed_out:
+                del self.running[resume_id]
+                finish_parse(resume_id, None, f'Parsing timed out after {timeout}s')
+            
+            for resume_id in self.running:
+                Resume.query.filter_by(id=resume_id).update({'status': 'pending'})
+            self.running.clear()
+            db.session.commit()
+    
+    def _requeue_stale(self):
+        """Return rows abandoned by a crashed process to the queue"""
+        cutoff = datetime.utcnow() - timedelta(seconds=2 * self.app.config['PARSE_QUEUE_TASK_TIMEOUT'])
+        Resume.query.filter(
+            Resume.status == 'parsing',
+            Resume.parse_started_at < cutoff,
+            Resume.id.notin_(list(self.running))
+        ).update({'status': 'pending'}, synchronize_session=False)
+        db.session.commit()
+    
+    def _fail_lost(self):
+        """Fail pending rows whose staged bytes were removed from disk"""
+        cutoff = datetime.utcnow() - timedelta(seconds=2 * self.app.config['PARSE_QUEUE_TASK_TIMEOUT'])
+        lost = [
+            resume_id
+            for resume_id, filename in db.session.query(Resume.id, Resume.filename).filter(
+                Resume.status == 'pending',
+                Resume.uploaded_at < cutoff
+            )
+            if not queued_upload_path(filename)
+        ]
+        if lost:
+            Resume.query.filter(Resume.id.in_(lost), Resume.status == 'pending').update({
+                'status': 'failed',
+                'parse_error': 'The upload was lost before it could be analyzed. Please upload it again.'
+            }, synchronize_session=False)
+            db.session.commit()
+    
+    def _prune_staging(self):
+        """Delete staged bytes that no queued resume is waiting for any more"""
+        folder = staging_folder()
+        cutoff = time.time() - 2 * self.app.config['PARSE_QUEUE_TASK_TIMEOUT']
+        try:
+            # Young files may belong to an upload that is still committing its row
+            old = [name for name in os.listdir(folder) if os.path.getmtime(os.path.join(folder, name)) < cutoff]
+        except FileNotFoundError:
+            return
+        if not old:
+            return
+        
+        waiting = {content_hash for (content_hash,) in db.session.query(Resume.content_hash).filter(
+            Resume.content_hash.in_([name.split('.', 1)[0] for name in old]),
+            Resume.status.in_(['pending', 'parsing'])
+        )}
+        for name in old:
+            # Leftover .part files are writes that never finished
+            if name.endswith('.part') or name.split('.', 1)[0] not in waiting:
+                try:
+                    os.remove(os.path.join(folder, name))
+                except FileNotFoundError:
+                    pass
+
+parse_queue = ParseQueue(app)
+
+class JobSearch:
+    """Ranked job search backed by an SQLite FTS5 index.
+    
+    job_fts is an external-content FTS5 table over job.title, company and
+    skills_required. Triggers keep it in sync with inserts, updates and
+    deletes on job, and results are ordered by bm25. On databases without
+    FTS5 the search falls back to ILIKE filtering.
+    """
+    
+    # bm25 column weights for title, company, skills_required
+    WEIGHTS = (10.0, 5.0, 3.0)
+    
+    SCHEMA = [
+        """CREATE VIRTUAL TABLE IF NOT EXISTS job_fts USING fts5(
+            title, company, skills_required, content='job', content_rowid='id'
+        )""",
+        """CREATE TRIGGER IF NOT EXISTS job_fts_insert AFTER INSERT ON job BEGIN
+            INSERT INTO job_fts(rowid, title, company, skills_required)
+            VALUES (new.id, new.title, new.company, new.skills_required);
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS job_fts_delete AFTER DELETE ON job BEGIN
+            INSERT INTO job_fts(job_fts, rowid, title, company, skills_required)
+            VALUES ('delete', old.id, old.title, old.company, old.skills_required);
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS job_fts_update AFTER UPDATE OF title, company, skills_required ON job BEGIN
+            INSERT INTO job_fts(job_fts, rowid, title, company, skills_required)
+            VALUES ('delete', old.id, old.title, old.company, old.skills_required);
+            INSERT INTO job_fts(rowid, title, company, skills_required)
+            VALUES (new.id, new.title, new.company, new.skills_required);
+        END"""
+    ]
+    
+    _available = False
+    
+    @classmethod
+    def setup(cls, conn):
+        """Create the FTS table and triggers, indexing existing jobs once"""
+        if conn.dialect.name != 'sqlite':
+            return
+        
+        exists = conn.exec_driver_sql("SELECT 1 FROM sqlite_master WHERE name = 'job_fts'").first()
+        try:
+            for statement in cls.SCHEMA:
+                conn.exec_driver_sql(statement)
+        except Exception as e:
+            print(f"Job search index unavailable: {e}")
+            return
+        
+        if not exists:
+            conn.exec_driver_sql("INSERT INTO job_fts(job_fts) VALUES ('rebuild')")
+            print("✅ Built job search index")
+    
+    @classmethod
+    def available(cls):
+        if not cls._available and db.engine.dialect.name == 'sqlite':
+            cls._available = db.session.execute(db.text("SELECT 1 FROM sqlite_master WHERE name = 'job_fts'")).first() is not None
+        return cls._available
+    
+    @staticmethod
+    def to_fts_query(search):
+        """Turn free text into an FTS5 query of quoted prefix terms"""
+        return ' '.join(f'"{term}"*' for term in re.findall(r'\w+', search.lower()))
+    
+    @classmethod
+    def search(cls, search, page, per_page):
+        """Return (jobs, total) for one page of active jobs matching search"""
+        if not cls.available():
+            query = Job.query.filter_by(is_active=True).filter(
+                db.or_(
+                    Job.title.ilike(f'%{search}%'),
+                    Job.company.ilike(f'%{search}%'),
+                    Job.skills_required.ilike(f'%{search}%')
+                )
+            )
+            total = query.count()
+            return query.order_by(Job.posted_date.desc()).offset((page - 1) * per_page).limit(per_page).all(), total
         
-        resume_set = set(s.lower() for s in resume_skills)
-        job_set = set(s.lower() for s in job_skills.split(','))
+        fts_query = cls.to_fts_query(search)
+        if not fts_query:
+            return [], 0
         
-        matching = list(resume_set & job_set)
-        missing = list(job_set - resume_set)
+        params = {'query': fts_query, 'limit': per_page, 'offset': (page - 1) * per_page}
+        total = db.session.execute(db.text(
+            "SELECT count(*) FROM job_fts JOIN job ON job.id = job_fts.rowid "
+            "WHERE job_fts MATCH :query AND job.is_active = 1"
+        ), params).scalar()
         
-        match_percentage = (len(matching) / len(job_set)) * 100 if job_set else 0
+        weights = ', '.join(str(weight) for weight in cls.WEIGHTS)
+        job_ids = db.session.execute(db.text(
+            f"SELECT job.id FROM job_fts JOIN job ON job.id = job_fts.rowid "
+            f"WHERE job_fts MATCH :query AND job.is_active = 1 "
+            f"ORDER BY bm25(job_fts, {weights}) LIMIT :limit OFFSET :offset"
+        ), params).scalars().all()
         
-        return match_percentage, matching, missing
+        jobs_by_id = {job.id: job for job in Job.query.filter(Job.id.in_(job_ids))}
+        return [jobs_by_id[job_id] for job_id in job_ids], total
+
+class StatsCache:
+    """In-process cache for the admin dashboard counters.
     
-    @staticmethod
-    def calculate_text_similarity(resume_text, job_description):
-        """Calculate text similarity using TF-IDF"""
-        try:
-            vectorizer = TfidfVectorizer(stop_words='english')
-            tfidf_matrix = vectorizer.fit_transform([resume_text, job_description])
-            similarity = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])[0][0]
-            return similarity * 100
-        except:
-            return 0
+    All five counts are fetched in one query and kept for ADMIN_STATS_TTL
+    seconds. Routes that add or remove users, resumes, jobs or matches
+    call invalidate(), so this process never shows stale numbers; other
+    processes catch up within the TTL.
+    """
     
-    @staticmethod
-    def calculate_experience_match(resume_exp, required_exp):
-        """Calculate experience match"""
-        if required_exp == 0:
-            return 100
-        return min((resume_exp / required_exp) * 100, 100) if resume_exp else 0
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.values = None
+        self.expires = 0
     
-    @classmethod
-    def match(cls, resume, job):
-        """Calculate overall match score"""
-        skill_match, matching, missing = cls.calculate_skill_match(
-            json.loads(resume.skills) if resume.skills else [],
-            job.skills_required or ""
-        )
-        
-        text_sim = cls.calculate_text_similarity(
-            resume.extracted_text or "",
-            job.description or ""
-        )
+    def get(self):
+        with self.lock:
+            if self.values is not None and time.monotonic() < self.expires:
+                return dict(self.values)
         
-        exp_match = cls.calculate_experience_match(
-            resume.experience_years or 0,
-            job.experience_required or 0
-        )
+        def count(model, *criteria):
+            return db.select(db.func.count()).select_from(model).where(*criteria).scalar_subquery()
         
-        overall = (skill_match * 0.5) + (text_sim * 0.3) + (exp_match * 0.2)
+        row = db.session.execute(db.select(
+            count(User).label('total_users'),
+            count(Resume).label('total_resumes'),
+            count(Job).label('total_jobs'),
+            count(Match).label('total_matches'),
+            count(Job, Job.is_active == True).label('active_jobs')
+        )).one()
+        values = dict(row._mapping)
         
-        return {
-            'score': round(overall, 1),
-            'matching_skills': matching,
-            'missing_skills': missing
-        }
+        with self.lock:
+            self.values = values
+            self.expires = time.monotonic() + app.config['ADMIN_STATS_TTL']
+        return dict(values)
+    
+    def invalidate(self):
+        with self.lock:
+            self.values = None
+
+admin_stats = StatsCache()
 
 # ========== UTILITY FUNCTIONS ========== #
 
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in app.config['ALLOWED_EXTENSIONS']
 
+def parse_result_columns(parsed):
+    """Map a ResumeParser.parse result onto Resume column values"""
+    return {
+        'extracted_text': parsed['text'],
+        'skills': json.dumps(parsed['skills']),
+        'experience_years': parsed['experience_years'],
+        'education': parsed['education'],
+        'email': parsed['email'],
+        'phone': parsed['phone'],
+        'score': parsed['score'],
+        'features': parsed['features'],
+        'features_version': parsed['features_version'],
+        'status': 'done',
+        'parse_error': None
+    }
+
+def apply_parse_result(resume, parsed):
+    """Copy a ResumeParser.parse result onto a Resume row"""
+    for column, value in parse_result_columns(parsed).items():
+        setattr(resume, column, value)
+
+def copy_parse_result(source, resume):
+    """Reuse the parse result of an identical, already parsed resume.
+    
+    The text and features stay on the row that holds them, and
+    ResumeFeatures.of reads through it by content_hash.
+    """
+    for column in ('skills', 'experience_years', 'education', 'email', 'phone', 'score'):
+        setattr(resume, column, getattr(source, column))
+    resume.status = 'done'
+    resume.parse_error = None
+
+def share_parse_result(resume):
+    """Drop the text and features of a resume when an identical one already holds them"""
+    held = db.session.query(Resume.id).filter(
+        Resume.content_hash == resume.content_hash,
+        Resume.id != resume.id,
+        Resume.features.isnot(None)
+    ).first()
+    if held:
+        resume.extracted_text = resume.features = resume.features_version = None
+
+def upload_filename(content_hash, extension):
+    """Content-addressed location of an upload, relative to UPLOAD_FOLDER"""
+    return f"{content_hash[:2]}/{content_hash}.{extension}"
+
+def write_atomically(filepath, data):
+    """Write bytes so that readers see either no file or the whole file"""
+    os.makedirs(os.path.dirname(filepath), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(filepath), suffix='.part')
+    with os.fdopen(fd, 'wb') as out:
+        out.write(data)
+    os.replace(tmp_path, filepath)
+
+def save_upload(data, filename):
+    """Write upload bytes into the content-addressed store.
+    
+    Identical content is stored only once under uploads/<aa>/<sha256>.<ext>,
+    and the file appears atomically so readers never see a partial write.
+    """
+    filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
+    if not os.path.exists(filepath):
+        write_atomically(filepath, data)
+
+def staging_folder():
+    """Where the bytes of queued uploads wait for their parse, visible to every process"""
+    return os.path.join(app.config['UPLOAD_FOLDER'], 'staging')
+
+def staging_path(filename):
+    return os.path.join(staging_folder(), os.path.basename(filename))
+
+def stage_upload(data, filename):
+    """Spool the bytes of a queued upload to its staging file"""
+    filepath = staging_path(filename)
+    if not os.path.exists(filepath):
+        write_atomically(filepath, data)
+
+def queued_upload_path(filename):
+    """File a pending resume is parsed from, or None when its bytes are gone"""
+    # Rows queued before uploads were staged have their file in the store
+    for filepath in (staging_path(filename), os.path.join(app.config['UPLOAD_FOLDER'], filename)):
+        if os.path.exists(filepath):
+            return os.path.abspath(filepath)
+    return None
+
+def unstage_upload(resume_id, filename, content_hash, promote=False):
+    """Promote a staged upload into the upload store, or drop it.
+    
+    While another queued resume has the same content the staging file
+    stays for it, and a successful parse links it into the store instead.
+    """
+    staged = staging_path(filename)
+    if not os.path.exists(staged):
+        return
+    
+    waiting = Resume.query.filter(
+        Resume.content_hash == content_hash,
+        Resume.id != resume_id,
+        Resume.status.in_(['pending', 'parsing'])
+    ).count()
+    target = os.path.join(app.config['UPLOAD_FOLDER'], filename)
+    
+    try:
+        if promote and not os.path.exists(target):
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            if not waiting:
+                os.replace(staged, target)
+                return
+            os.link(staged, target)
+        if not waiting:
+            os.remove(staged)
+    except (FileNotFoundError, FileExistsError):
+        # Another process finishing the same content got there first
+        pass
+
+def release_upload(filename, content_hash=None):
+    """Delete an uploaded file unless another resume still shares it"""
+    if content_hash and Resume.query.filter(
+        Resume.content_hash == content_hash,
+        Resume.filename == filename,
+        Resume.status != 'failed'
+    ).count():
+        return
+    
+    filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
+    if os.path.exists(filepath):
+        os.remove(filepath)
+
+def finish_parse(resume_id, parsed, error=None):
+    """Store the outcome of a background parse.
+    
+    The staged bytes move into the upload store only when parsing
+    succeeded, and are dropped when it failed or timed out.
+    """
+    resume = db.session.get(Resume, resume_id)
+    if resume is None:
+        return
+    
+    if parsed:
+        # The file is in the store before the row says done
+        unstage_upload(resume.id, resume.filename, resume.content_hash, promote=True)
+        apply_parse_result(resume, parsed)
+        # A duplicate queued alongside may have finished first
+        share_parse_result(resume)
+    else:
+        resume.status = 'failed'
+        resume.parse_error = (error or 'Failed to parse resume. Please check the file format.')[:200]
+    
+    db.session.commit()
+    
+    if parsed:
+        candidate_index.add(resume.id, SkillStore.resume_skill_names(resume.skills))
+    else:
+        unstage_upload(resume.id, resume.filename, resume.content_hash)
+        release_upload(resume.filename, resume.content_hash)
+
+def ingest_upload(file, user_id):
+    """Store one uploaded resume and create its Resume row.
+    
+    Identical content reuses an earlier parse, otherwise the file is queued
+    for background parsing or parsed inline. Returns (resume, error) and
+    resume is None when the file was rejected or could not be parsed.
+    """
+    if not file or file.filename == '':
+        return None, 'No file selected'
+    
+    if not allowed_file(file.filename):
+        return None, 'Invalid file type. Only PDF and DOCX allowed'
+    
+    if app.config['PARSE_QUEUE_WORKERS'] and parse_queue.is_full():
+        return None, 'Too many resumes are waiting to be analyzed. Please try again shortly.'
+    
+    # Uploads are capped by MAX_CONTENT_LENGTH, so hash and parse them in memory
+    original_name = file.filename
+    extension = original_name.rsplit('.', 1)[1].lower()
+    with metrics.timer('upload_seconds', stage='read'):
+        data = file.stream.read()
+        content_hash = hashlib.sha256(data).hexdigest()
+    filename = upload_filename(content_hash, extension)
+    
+    resume = Resume(
+        user_id=user_id,
+        filename=filename,
+        original_name=original_name,
+        content_hash=content_hash
+    )
+    
+    # Identical content was parsed before, reuse its result
+    cached = Resume.query.filter_by(content_hash=content_hash, status='done').first()
+    if cached:
+        copy_parse_result(cached, resume)
+    elif app.config['PARSE_QUEUE_WORKERS']:
+        # Stage the bytes for background parsing, finish_parse stores them on success
+        resume.status = 'pending'
+        with metrics.timer('upload_seconds', stage='stage'):
+            stage_upload(data, filename)
+    else:
+        parsed = ResumeParser.parse(data, extension)
+        
+        # Files that fail to parse never touch the disk
+        if not parsed:
+            return None, 'Failed to parse resume. Please check the file format.'
+        
+        apply_parse_result(resume, parsed)
+    
+    if resume.status != 'pending':
+        with metrics.timer('upload_seconds', stage='save'):
+            save_upload(data, filename)
+    
+    with metrics.timer('upload_seconds', stage='commit'):
+        db.session.add(resume)
+        db.session.commit()
+    admin_stats.invalidate()
+    
+    if resume.status == 'pending':
+        parse_queue.notify()
+    else:
+        candidate_index.add(resume.id, SkillStore.resume_skill_names(resume.skills))
+    
+    return resume, None
+
+def encode_cursor(timestamp, row_id):
+    """Opaque cursor for a (timestamp, id) keyset position"""
+    raw = json.dumps([timestamp.isoformat(), row_id]).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+def decode_cursor(cursor):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        timestamp, row_id = json.loads(raw)
+        return datetime.fromisoformat(timestamp), int(row_id)
+    except Exception:
+        abort(400)
+
+def keyset_page(query, sort_column, id_column):
+    """Return (items, next_cursor, prev_cursor) for a newest-first list.
+    
+    Pages seek on (sort_column, id) from the ?after= / ?before= cursors
+    instead of using OFFSET, so page N costs the same as page 1.
+    """
+    per_page = min(max(request.args.get('per_page', app.config['PAGE_SIZE'], type=int), 1), 100)
+    after = request.args.get('after')
+    before = request.args.get('before')
+    
+    if before:
+        timestamp, row_id = decode_cursor(before)
+        rows = (
+            query.filter(db.or_(sort_column > timestamp, db.and_(sort_column == timestamp, id_column > row_id)))
+            .order_by(sort_column.asc(), id_column.asc())
+            .limit(per_page + 1)
+            .all()
+        )
+        has_more = len(rows) > per_page
+        items = rows[:per_page][::-1]
+        next_cursor = encode_cursor(getattr(items[-1], sort_column.key), items[-1].id) if items else None
+        prev_cursor = encode_cursor(getattr(items[0], sort_column.key), items[0].id) if has_more else None
+        return items, next_cursor, prev_cursor
+    
+    if after:
+        timestamp, row_id = decode_cursor(after)
+        query = query.filter(db.or_(sort_column < timestamp, db.and_(sort_column == timestamp, id_column < row_id)))
+    
+    rows = query.order_by(sort_column.desc(), id_column.desc()).limit(per_page + 1).all()
+    items = rows[:per_page]
+    next_cursor = encode_cursor(getattr(items[-1], sort_column.key), items[-1].id) if len(rows) > per_page else None
+    prev_cursor = encode_cursor(getattr(items[0], sort_column.key), items[0].id) if after and items else None
+    return items, next_cursor, prev_cursor
+
+def job_to_dict(job):
+    return {
+        'id': job.id,
+        'title': job.title,
+        'company': job.company,
+        'description': job.description,
+        'skills_required': sorted(JobMatcher.job_skill_set(job.skills_required)),
+        'experience_required': job.experience_required,
+        'location': job.location,
+        'salary': job.salary,
+        'job_type': job.job_type,
+        'posted_date': job.posted_date.isoformat() if job.posted_date else None,
+        'is_active': job.is_active
+    }
+
+def resume_to_dict(resume):
+    return {
+        'id': resume.id,
+        'name': resume.original_name,
+        'status': resume.status,
+        'score': resume.score,
+        'skills': json.loads(resume.skills) if resume.skills else [],
+        'experience_years': resume.experience_years,
+        'education': resume.education,
+        'email': resume.email,
+        'phone': resume.phone,
+        'error': resume.parse_error,
+        'uploaded_at': resume.uploaded_at.isoformat() if resume.uploaded_at else None
+    }
+
+def resume_counts_for(users):
+    """Count resumes per user in SQL instead of loading every user.resumes"""
+    user_ids = [user.id for user in users]
+    return dict(
+        db.session.query(Resume.user_id, db.func.count(Resume.id))
+        .filter(Resume.user_id.in_(user_ids))
+        .group_by(Resume.user_id)
+        .all()
+    )
+
 @login_manager.user_loader
 def load_user(user_id):
     return User.query.get(int(user_id))
 
 # ========== ROUTES ========== #
 
+@app.before_request
+def start_parse_queue():
+    # Under a WSGI server the first request stands in for startup, so rows
+    # left pending by a restart are parsed without waiting for an upload
+    parse_queue.start()
+
+@app.before_request
+def start_request_timer():
+    g.request_id = request.headers.get('X-Request-ID') or uuid.uuid4().hex
+    g.request_started = time.perf_counter()
+
+@app.after_request
+def finish_request_timer(response):
+    if 'request_started' not in g:
+        return response
+    
+    elapsed = time.perf_counter() - g.request_started
+    response.headers['X-Request-ID'] = g.request_id
+    
+    if app.config['REQUEST_LOG_ENABLED']:
+        request_log.info(json.dumps({
+            'request_id': g.request_id,
+            'method': request.method,
+            'path': request.path,
+            'endpoint': request.endpoint,
+            'status': response.status_code,
+            'duration_ms': round(elapsed * 1000, 2),
+            'stages_ms': {stage: round(seconds * 1000, 2) for stage, seconds in g.get('stages', {}).items()}
+        }))
+    
+    metrics.observe('http_request_seconds', elapsed, method=request.method, endpoint=request.endpoint or 'none', status=response.status_code)
+    return response
+
+@app.route('/metrics')
+def prometheus_metrics():
+    if not app.config['METRICS_ENABLED']:
+        abort(404)
+    return metrics.render(), 200, {'Content-Type': 'text/plain; version=0.0.4; charset=utf-8'}
+
 @app.route('/')
 def index():
     return render_template('index.html')
@@ -375,6 +2926,7 @@ def register():
         user = User(username=username, email=email or None, password=hashed)
         db.session.add(user)
         db.session.commit()
+        admin_stats.invalidate()
         
         flash('Registration successful! Please login.', 'success')
         return redirect(url_for('login'))
@@ -413,10 +2965,19 @@ def logout():
 def dashboard():
     resumes = Resume.query.filter_by(user_id=current_user.id).order_by(Resume.uploaded_at.desc()).all()
     
-    # Calculate statistics
-    total_resumes = len(resumes)
-    avg_score = sum(r.score for r in resumes) / total_resumes if total_resumes else 0
-    total_matches = Match.query.join(Resume).filter(Resume.user_id == current_user.id).count()
+    # Calculate statistics in one aggregate query
+    match_count = (
+        db.select(db.func.count(Match.id))
+        .join(Resume, Match.resume_id == Resume.id)
+        .where(Resume.user_id == current_user.id)
+        .scalar_subquery()
+    )
+    total_resumes, avg_score, total_matches = db.session.query(
+        db.func.count(Resume.id),
+        db.func.avg(Resume.score),
+        match_count
+    ).filter(Resume.user_id == current_user.id).one()
+    avg_score = avg_score or 0
     
     stats = {
         'total_resumes': total_resumes,
@@ -429,54 +2990,33 @@ def dashboard():
 @app.route('/upload', methods=['POST'])
 @login_required
 def upload():
-    if 'resume' not in request.files:
-        flash('No file uploaded', 'danger')
-        return redirect(url_for('dashboard'))
-    
-    file = request.files['resume']
-    
-    if file.filename == '':
-        flash('No file selected', 'danger')
-        return redirect(url_for('dashboard'))
+    resume, error = ingest_upload(request.files.get('resume'), current_user.id)
     
-    if not allowed_file(file.filename):
-        flash('Invalid file type. Only PDF and DOCX allowed', 'danger')
-        return redirect(url_for('dashboard'))
-    
-    # Save file
-    original_name = file.filename
-    timestamp = datetime.now().strftime('%Y%m%d%H%M%S')
-    filename = f"{current_user.id}_{timestamp}_{secure_filename(original_name)}"
-    filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-    file.save(filepath)
-    
-    # Parse resume
-    parsed = ResumeParser.parse(filepath)
-    
-    if not parsed:
-        os.remove(filepath)
-        flash('Failed to parse resume. Please check the file format.', 'danger')
+    if error:
+        flash(error, 'danger')
         return redirect(url_for('dashboard'))
     
-    # Save to database
-    resume = Resume(
-        user_id=current_user.id,
-        filename=filename,
-        original_name=original_name,
-        extracted_text=parsed['text'],
-        skills=json.dumps(parsed['skills']),
-        experience_years=parsed['experience_years'],
-        education=parsed['education'],
-        email=parsed['email'],
-        phone=parsed['phone'],
-        score=parsed['score']
-    )
+    if resume.status == 'pending':
+        flash('Resume uploaded! Analysis is in progress.', 'success')
+    else:
+        flash(f'Resume uploaded! Score: {resume.score}/100', 'success')
+    return redirect(url_for('view_resume', resume_id=resume.id))
+
+@app.route('/api/resume/<int:resume_id>/status')
+@login_required
+def resume_status(resume_id):
+    resume = Resume.query.get_or_404(resume_id)
     
-    db.session.add(resume)
-    db.session.commit()
+    if resume.user_id != current_user.id and not current_user.is_admin:
+        return jsonify({'success': False}), 403
     
-    flash(f'Resume uploaded! Score: {parsed["score"]}/100', 'success')
-    return redirect(url_for('view_resume', resume_id=resume.id))
+    return jsonify({
+        'success': True,
+        'id': resume.id,
+        'status': resume.status,
+        'score': resume.score,
+        'error': resume.parse_error
+    })
 
 @app.route('/resume/<int:resume_id>')
 @login_required
@@ -487,65 +3027,105 @@ def view_resume(resume_id):
         flash('Access denied', 'danger')
         return redirect(url_for('dashboard'))
     
-    skills = json.loads(resume.skills) if resume.skills else []
-    matches = Match.query.filter_by(resume_id=resume_id).order_by(Match.match_score.desc()).limit(10).all()
+    skills = SkillStore.resume_skills(resume_id)
+    matches = (
+        Match.query.options(db.joinedload(Match.job))
+        .filter_by(resume_id=resume_id)
+        .order_by(Match.match_score.desc())
+        .limit(10)
+        .all()
+    )
     
     return render_template('resume_detail.html', resume=resume, skills=skills, matches=matches)
 
 @app.route('/match/<int:resume_id>')
 @login_required
 def match_resume(resume_id):
-    resume = Resume.query.get_or_404(resume_id)
+    resume = Resume.query.options(db.undefer(Resume.features)).get_or_404(resume_id)
     
     if resume.user_id != current_user.id and not current_user.is_admin:
         flash('Access denied', 'danger')
         return redirect(url_for('dashboard'))
     
+    if resume.status != 'done':
+        flash('Resume analysis is not finished yet', 'warning')
+        return redirect(url_for('view_resume', resume_id=resume_id))
+    
     jobs = Job.query.filter_by(is_active=True).all()
     
     if not jobs:
         flash('No active jobs available', 'warning')
         return redirect(url_for('view_resume', resume_id=resume_id))
     
-    # Delete old matches
-    Match.query.filter_by(resume_id=resume_id).delete()
-    
-    # Create new matches
-    for job in jobs:
-        result = JobMatcher.match(resume, job)
-        
-        match = Match(
-            resume_id=resume_id,
-            job_id=job.id,
-            match_score=result['score'],
-            matching_skills=json.dumps(result['matching_skills']),
-            missing_skills=json.dumps(result['missing_skills'])
-        )
-        db.session.add(match)
-    
-    db.session.commit()
+    # Score against every active job at once and replace old matches
+    matcher = BatchMatcher(jobs)
+    matcher.save([resume], *matcher.score([resume]))
+    admin_stats.invalidate()
     
     flash(f'Matched with {len(jobs)} jobs!', 'success')
     return redirect(url_for('view_resume', resume_id=resume_id))
 
+@app.route('/api/resume/<int:resume_id>/matches')
+@login_required
+def resume_matches(resume_id):
+    """Page through every active job ranked for a resume, without storing rows"""
+    resume = Resume.query.options(db.undefer(Resume.features)).get_or_404(resume_id)
+    
+    if resume.user_id != current_user.id and not current_user.is_admin:
+        return jsonify({'success': False}), 403
+    
+    if resume.status != 'done':
+        return jsonify({'success': False, 'error': 'Resume analysis is not finished yet'}), 409
+    
+    page = max(request.args.get('page', 1, type=int), 1)
+    per_page = min(max(request.args.get('per_page', app.config['MATCH_TOP_K'] or 10, type=int), 1), 100)
+    
+    jobs = Job.query.filter_by(is_active=True).all()
+    if not jobs:
+        return jsonify({'success': True, 'page': page, 'per_page': per_page, 'total': 0, 'matches': []})
+    
+    matcher = BatchMatcher(jobs)
+    scores, resume_skills = matcher.score([resume])
+    ranked = matcher.top_k(scores, page * per_page)[0][(page - 1) * per_page:]
+    # Semantic mode leaves unretrieved jobs unscored
+    ranked = ranked[np.isfinite(scores[0, ranked])]
+    total = int(np.isfinite(scores[0]).sum())
+    
+    matches = []
+    for j in ranked:
+        matching, missing = matcher.match_details(resume_skills[0], j)
+        matches.append({
+            'job_id': jobs[j].id,
+            'title': jobs[j].title,
+            'company': jobs[j].company,
+            'score': float(scores[0, j]),
+            'matching_skills': matching,
+            'missing_skills': missing
+        })
+    
+    return jsonify({'success': True, 'page': page, 'per_page': per_page, 'total': total, 'matches': matches})
+
 @app.route('/jobs')
 def jobs():
     search = request.args.get('search', '').strip()
     
-    query = Job.query.filter_by(is_active=True)
-    
     if search:
-        query = query.filter(
-            db.or_(
-                Job.title.ilike(f'%{search}%'),
-                Job.company.ilike(f'%{search}%'),
-                Job.skills_required.ilike(f'%{search}%')
-            )
-        )
+        page = max(request.args.get('page', 1, type=int), 1)
+        per_page = app.config['JOB_SEARCH_PER_PAGE']
+        results, total = JobSearch.search(search, page, per_page)
+        pages = (total + per_page - 1) // per_page
+        
+        return render_template('jobs.html', jobs=results, search=search, page=page, pages=pages, total=total)
     
-    all_jobs = query.order_by(Job.posted_date.desc()).all()
+    page_jobs, next_cursor, prev_cursor = keyset_page(Job.query.filter_by(is_active=True), Job.posted_date, Job.id)
     
-    return render_template('jobs.html', jobs=all_jobs, search=search)
+    return render_template('jobs.html', jobs=page_jobs, search=search, next_cursor=next_cursor, prev_cursor=prev_cursor)
+
+@app.route('/api/jobs')
+@app.route('/api/v1/jobs')
+def api_jobs():
+    page_jobs, next_cursor, prev_cursor = keyset_page(Job.query.filter_by(is_active=True), Job.posted_date, Job.id)
+    return jsonify({'jobs': [job_to_dict(job) for job in page_jobs], 'next': next_cursor, 'prev': prev_cursor})
 
 @app.route('/job/<int:job_id>')
 def view_job(job_id):
@@ -563,13 +3143,17 @@ def delete_resume(resume_id):
         flash('Access denied', 'danger')
         return redirect(url_for('dashboard'))
     
-    # Delete file
-    filepath = os.path.join(app.config['UPLOAD_FOLDER'], resume.filename)
-    if os.path.exists(filepath):
-        os.remove(filepath)
+    filename, content_hash = resume.filename, resume.content_hash
+    skills = SkillStore.resume_skill_names(resume.skills)
     
     db.session.delete(resume)
     db.session.commit()
+    admin_stats.invalidate()
+    candidate_index.remove(resume_id, skills)
+    
+    # Delete file once nothing else shares it, and the staged bytes of a resume still queued
+    release_upload(filename, content_hash)
+    unstage_upload(resume_id, filename, content_hash)
     
     flash('Resume deleted successfully', 'success')
     return redirect(url_for('dashboard'))
@@ -583,16 +3167,10 @@ def admin_dashboard():
         flash('Admin access required', 'danger')
         return redirect(url_for('index'))
     
-    stats = {
-        'total_users': User.query.count(),
-        'total_resumes': Resume.query.count(),
-        'total_jobs': Job.query.count(),
-        'total_matches': Match.query.count(),
-        'active_jobs': Job.query.filter_by(is_active=True).count()
-    }
+    stats = admin_stats.get()
     
     recent_users = User.query.order_by(User.created_at.desc()).limit(5).all()
-    recent_resumes = Resume.query.order_by(Resume.uploaded_at.desc()).limit(5).all()
+    recent_resumes = Resume.query.options(db.joinedload(Resume.user)).order_by(Resume.uploaded_at.desc()).limit(5).all()
     
     return render_template('admin_dashboard.html', stats=stats, recent_users=recent_users, recent_resumes=recent_resumes)
 
@@ -618,6 +3196,10 @@ def add_job():
         db.session.add(job)
         db.session.commit()
         
+        if job.is_active:
+            BatchMatcher.add_job_matches(job)
+        admin_stats.invalidate()
+        
         flash('Job posted successfully!', 'success')
         return redirect(url_for('admin_jobs'))
     
@@ -630,8 +3212,17 @@ def admin_jobs():
         flash('Admin access required', 'danger')
         return redirect(url_for('index'))
     
-    all_jobs = Job.query.order_by(Job.posted_date.desc()).all()
-    return render_template('admin_jobs.html', jobs=all_jobs)
+    page_jobs, next_cursor, prev_cursor = keyset_page(Job.query, Job.posted_date, Job.id)
+    return render_template('admin_jobs.html', jobs=page_jobs, next_cursor=next_cursor, prev_cursor=prev_cursor)
+
+@app.route('/api/admin/jobs')
+@login_required
+def api_admin_jobs():
+    if not current_user.is_admin:
+        return jsonify({'success': False}), 403
+    
+    page_jobs, next_cursor, prev_cursor = keyset_page(Job.query, Job.posted_date, Job.id)
+    return jsonify({'jobs': [job_to_dict(job) for job in page_jobs], 'next': next_cursor, 'prev': prev_cursor})
 
 @app.route('/admin/toggle-job/<int:job_id>', methods=['POST'])
 @login_required
@@ -643,6 +3234,14 @@ def toggle_job(job_id):
     job.is_active = not job.is_active
     db.session.commit()
     
+    if job.is_active:
+        BatchMatcher.add_job_matches(job)
+    else:
+        job_index.remove(job.id)
+        job_index.flush()
+        BatchMatcher.remove_job_matches(job.id)
+    admin_stats.invalidate()
+    
     return jsonify({'success': True, 'is_active': job.is_active})
 
 @app.route('/admin/delete-job/<int:job_id>', methods=['POST'])
@@ -653,12 +3252,64 @@ def delete_job(job_id):
         return redirect(url_for('index'))
     
     job = Job.query.get_or_404(job_id)
+    BatchMatcher.remove_job_matches(job_id)
     db.session.delete(job)
     db.session.commit()
+    admin_stats.invalidate()
+    
+    job_index.remove(job_id)
+    job_index.flush()
     
     flash('Job deleted successfully', 'success')
     return redirect(url_for('admin_jobs'))
 
+@app.route('/admin/job/<int:job_id>/candidates')
+@login_required
+def job_candidates(job_id):
+    """Rank the best resumes for a job via the reverse skill index"""
+    if not current_user.is_admin:
+        return jsonify({'success': False}), 403
+    
+    job = Job.query.get_or_404(job_id)
+    limit = min(max(request.args.get('limit', 20, type=int), 1), 100)
+    
+    shortlist = dict(candidate_index.candidates(JobMatcher.job_skill_set(job.skills_required), app.config['CANDIDATE_POOL_SIZE']))
+    resumes = (
+        Resume.query.options(db.joinedload(Resume.user), db.undefer(Resume.features))
+        .filter(Resume.id.in_(list(shortlist)), Resume.status == 'done')
+        .all()
+    )
+    
+    if not resumes:
+        return jsonify({'success': True, 'job_id': job.id, 'candidates': []})
+    
+    # Inactive jobs are not in the shared index, so score them on their own
+    if job.is_active:
+        index = job_index
+        index.ensure_loaded()
+    else:
+        index = JobIndex()
+    if job.id not in index:
+        index.add(job)
+    
+    matcher = BatchMatcher([job], index=index)
+    scores, resume_skills = matcher.score(resumes)
+    
+    candidates = []
+    for i in BatchMatcher.top_k(scores.T, limit)[0]:
+        matching, missing = matcher.match_details(resume_skills[i], 0)
+        candidates.append({
+            'resume_id': resumes[i].id,
+            'username': resumes[i].user.username,
+            'original_name': resumes[i].original_name,
+            'score': float(scores[i, 0]),
+            'shared_skills': shortlist[resumes[i].id],
+            'matching_skills': matching,
+            'missing_skills': missing
+        })
+    
+    return jsonify({'success': True, 'job_id': job.id, 'candidates': candidates})
+
 @app.route('/admin/users')
 @login_required
 def admin_users():
@@ -666,25 +3317,228 @@ def admin_users():
         flash('Admin access required', 'danger')
         return redirect(url_for('index'))
     
-    all_users = User.query.order_by(User.created_at.desc()).all()
-    return render_template('admin_users.html', users=all_users)
+    page_users, next_cursor, prev_cursor = keyset_page(User.query, User.created_at, User.id)
+    
+    return render_template(
+        'admin_users.html',
+        users=page_users,
+        resume_counts=resume_counts_for(page_users),
+        next_cursor=next_cursor,
+        prev_cursor=prev_cursor
+    )
+
+@app.route('/api/admin/users')
+@login_required
+def api_admin_users():
+    if not current_user.is_admin:
+        return jsonify({'success': False}), 403
+    
+    page_users, next_cursor, prev_cursor = keyset_page(User.query, User.created_at, User.id)
+    resume_counts = resume_counts_for(page_users)
+    
+    users = [{
+        'id': user.id,
+        'username': user.username,
+        'email': user.email,
+        'is_admin': user.is_admin,
+        'resumes': resume_counts.get(user.id, 0),
+        'created_at': user.created_at.isoformat() if user.created_at else None
+    } for user in page_users]
+    
+    return jsonify({'users': users, 'next': next_cursor, 'prev': prev_cursor})
+
+# ========== API V1 ========== #
+
+def api_login_required(view):
+    """Like login_required, but answers 401 JSON instead of redirecting"""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if not current_user.is_authenticated:
+            return jsonify({'success': False, 'error': 'Authentication required'}), 401
+        return view(*args, **kwargs)
+    return wrapper
+
+def match_resumes(resumes):
+    """Score parsed resumes against the active jobs and store their matches.
+    
+    Returns one {'resume_id', 'matches'} entry per resume, where matches
+    holds the top MATCH_TOP_K jobs as [job_id, score] pairs.
+    """
+    jobs = Job.query.filter_by(is_active=True).all()
+    if not jobs:
+        return [{'resume_id': resume.id, 'matches': []} for resume in resumes]
+    
+    matcher = BatchMatcher(jobs)
+    chunk_size = app.config['BATCH_MATCH_CHUNK_SIZE']
+    results = []
+    
+    for start in range(0, len(resumes), chunk_size):
+        chunk = resumes[start:start + chunk_size]
+        scores, resume_skills = matcher.score(chunk)
+        matcher.save(chunk, scores, resume_skills)
+        
+        for i, columns in enumerate(matcher.top_k(scores, app.config['MATCH_TOP_K'])):
+            results.append({
+                'resume_id': chunk[i].id,
+                'matches': [[jobs[j].id, float(scores[i, j])] for j in columns if np.isfinite(scores[i, j])]
+            })
+    
+    admin_stats.invalidate()
+    return results
+
+@login_manager.request_loader
+def load_user_from_request(request):
+    """HTTP Basic credentials let API clients skip the login form"""
+    auth = request.authorization
+    if not auth or not request.path.startswith('/api/'):
+        return None
+    
+    user = User.query.filter_by(username=auth.username).first()
+    if user and check_password_hash(user.password, auth.password or ''):
+        return user
+    return None
+
+@app.route('/api/v1/resumes', methods=['GET'])
+@api_login_required
+def api_list_resumes():
+    page_resumes, next_cursor, prev_cursor = keyset_page(
+        Resume.query.filter_by(user_id=current_user.id), Resume.uploaded_at, Resume.id
+    )
+    return jsonify({'resumes': [resume_to_dict(resume) for resume in page_resumes], 'next': next_cursor, 'prev': prev_cursor})
+
+@app.route('/api/v1/resumes', methods=['POST'])
+@api_login_required
+def api_upload_resume():
+    resume, error = ingest_upload(request.files.get('resume'), current_user.id)
+    
+    if error:
+        return jsonify({'success': False, 'error': error}), 400
+    
+    return jsonify(resume_to_dict(resume)), 202 if resume.status == 'pending' else 201
+
+@app.route('/api/v1/resumes/batch', methods=['POST'])
+@api_login_required
+def api_upload_resumes():
+    """Upload many resumes in one multipart request (repeat the 'resumes' field)"""
+    files = request.files.getlist('resumes')
+    
+    if not files:
+        return jsonify({'success': False, 'error': 'No files uploaded'}), 400
+    
+    if len(files) > app.config['API_BATCH_MAX_FILES']:
+        return jsonify({'success': False, 'error': f"At most {app.config['API_BATCH_MAX_FILES']} files per request"}), 400
+    
+    results = []
+    for file in files:
+        resume, error = ingest_upload(file, current_user.id)
+        if error:
+            results.append({'name': file.filename, 'error': error})
+        else:
+            results.append({'name': file.filename, 'id': resume.id, 'status': resume.status, 'score': resume.score})
+    
+    return jsonify({'success': True, 'resumes': results})
+
+@app.route('/api/v1/resumes/<int:resume_id>')
+@api_login_required
+def api_get_resume(resume_id):
+    resume = Resume.query.get_or_404(resume_id)
+    
+    if resume.user_id != current_user.id and not current_user.is_admin:
+        return jsonify({'success': False}), 403
+    
+    return jsonify(resume_to_dict(resume))
+
+@app.route('/api/v1/match', methods=['POST'])
+@api_login_required
+def api_match():
+    """Match a list of resume IDs against the active jobs in one call"""
+    resume_ids = (request.get_json(silent=True) or {}).get('resume_ids')
+    
+    if not isinstance(resume_ids, list) or not all(type(resume_id) is int for resume_id in resume_ids):
+        return jsonify({'success': False, 'error': 'resume_ids must be a list of integers'}), 400
+    
+    if len(resume_ids) > app.config['API_BATCH_MAX_RESUMES']:
+        return jsonify({'success': False, 'error': f"At most {app.config['API_BATCH_MAX_RESUMES']} resumes per request"}), 400
+    
+    query = Resume.query.options(db.undefer(Resume.features)).filter(Resume.id.in_(resume_ids))
+    if not current_user.is_admin:
+        query = query.filter_by(user_id=current_user.id)
+    found = {resume.id: resume for resume in query}
+    
+    errors = {}
+    resumes = []
+    for resume_id in dict.fromkeys(resume_ids):
+        resume = found.get(resume_id)
+        if resume is None:
+            errors[resume_id] = 'Resume not found'
+        elif resume.status != 'done':
+            errors[resume_id] = 'Resume analysis is not finished yet'
+        else:
+            resumes.append(resume)
+    
+    results = match_resumes(resumes) if resumes else []
+    
+    return jsonify({'success': True, 'results': results, 'errors': errors})
+
+@app.route('/api/v1/resumes/<int:resume_id>/match', methods=['POST'])
+@api_login_required
+def api_match_resume(resume_id):
+    resume = Resume.query.options(db.undefer(Resume.features)).get_or_404(resume_id)
+    
+    if resume.user_id != current_user.id and not current_user.is_admin:
+        return jsonify({'success': False}), 403
+    
+    if resume.status != 'done':
+        return jsonify({'success': False, 'error': 'Resume analysis is not finished yet'}), 409
+    
+    return jsonify(match_resumes([resume])[0])
 
 # ========== ERROR HANDLERS ========== #
 
 @app.errorhandler(404)
 def not_found(e):
+    if request.path.startswith('/api/'):
+        return jsonify({'success': False, 'error': 'Not found'}), 404
     return render_template('404.html'), 404
 
 @app.errorhandler(413)
 def file_too_large(e):
+    if request.path.startswith('/api/'):
+        return jsonify({'success': False, 'error': 'File too large. Maximum size is 16MB'}), 413
     flash('File too large. Maximum size is 16MB', 'danger')
     return redirect(url_for('dashboard'))
 
 # ========== DATABASE INITIALIZATION ========== #
 
+def upgrade_db():
+    """Add columns, indexes and the search index missing from an existing database"""
+    inspector = db.inspect(db.engine)
+    preparer = db.engine.dialect.identifier_preparer
+    
+    with db.engine.begin() as conn:
+        for table in db.metadata.sorted_tables:
+            existing = {column['name'] for column in inspector.get_columns(table.name)}
+            
+            for column in table.columns:
+                if column.name in existing:
+                    continue
+                
+                ddl = f"ALTER TABLE {preparer.quote(table.name)} ADD COLUMN {preparer.quote(column.name)} {column.type.compile(dialect=db.engine.dialect)}"
+                if column.server_default is not None:
+                    ddl += f" DEFAULT '{column.server_default.arg}'"
+                conn.execute(db.text(ddl))
+                print(f"✅ Added column {table.name}.{column.name}")
+            
+            for index in table.indexes:
+                index.create(bind=conn, checkfirst=True)
+        
+        JobSearch.setup(conn)
+        SkillStore.backfill(conn)
+
 def init_db():
     with app.app_context():
         db.create_all()
+        upgrade_db()
         
         if not User.query.filter_by(username='admin').first():
             admin = User(
@@ -761,6 +3615,9 @@ def init_db():
 
 if __name__ == '__main__':
     init_db()
+    # Resume parsing left pending by the last run; the reloader's parent process only watches files
+    if os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        parse_queue.start()
     print("\n" + "="*60)
     print("🚀 Resume Analyzer Server Starting...")
     print("="*60)
@@ -0,0 +1,32 @@
+import argparse
+import time
+
+from app import app, db, Job, Resume, Match, BatchMatcher, upgrade_db
+
+def batch_match(chunk_size):
+    with app.app_context():
+        db.create_all()
+        upgrade_db()
+        
+        resumes = Resume.query.filter_by(status='done').count()
+        jobs = Job.query.filter_by(is_active=True).count()
+        print(f"📊 Matching {resumes} resumes against {jobs} active jobs (chunks of {chunk_size})\n")
+        
+        started = time.monotonic()
+        total = BatchMatcher.rematch_all(chunk_size)
+        elapsed = time.monotonic() - started
+        
+        print("="*60)
+        print(f"✅ Matched {total} resumes, {Match.query.count()} match rows stored")
+        print(f"⏱️  {elapsed:.1f}s ({total / elapsed if elapsed else 0:.1f} resumes/sec)")
+        print("="*60)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Re-match all resumes against the active jobs')
+    parser.add_argument('--chunk-size', type=int, default=app.config['BATCH_MATCH_CHUNK_SIZE'], help='resumes scored per chunk')
+    args = parser.parse_args()
+    
+    print("="*60)
+    print("🎯 BATCH MATCHING")
+    print("="*60)
+    batch_match(args.chunk_size)
@@ -0,0 +1,270 @@
+import argparse
+import json
+import math
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import textwrap
+import time
+from datetime import datetime
+from io import BytesIO
+
+from docx import Document
+
+# Benchmarks always run against a throwaway database, never resume.db
+WORKDIR = tempfile.mkdtemp(prefix='resume_bench_')
+os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(WORKDIR, 'bench.db')
+
+from app import app, db, User, Resume, Job, ResumeParser, JobMatcher, BatchMatcher, generate_password_hash, parse_result_columns, upgrade_db
+
+FIRST_NAMES = ['Alex', 'Priya', 'Sam', 'Maria', 'Wei', 'Omar', 'Lena', 'Ravi', 'Chloe', 'Diego']
+LAST_NAMES = ['Sharma', 'Smith', 'Chen', 'Garcia', 'Khan', 'Müller', 'Okafor', 'Rossi', 'Tanaka', 'Novak']
+DEGREES = ['Bachelor of Technology', 'Master of Science', 'PhD in Computer Science', 'MBA', 'B.Sc Mathematics']
+COMPANIES = ['Tech Corp', 'StartUp Inc', 'AI Solutions', 'DataWorks', 'CloudNine', 'Fintech Labs']
+TITLES = ['Backend Engineer', 'Data Scientist', 'Full Stack Developer', 'DevOps Engineer', 'ML Engineer']
+FILLER = (
+    'designed built maintained scalable services team customers delivered improved performance '
+    'reduced latency migrated legacy platform owned roadmap mentored engineers reviewed code '
+    'automated deployment pipelines monitored production incidents collaborated stakeholders'
+).split()
+
+# ========== SYNTHETIC CORPUS ========== #
+
+def make_resume_text(rng, words):
+    """Resume text of roughly `words` words with contact details, experience and skills"""
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    skills = rng.sample(ResumeParser.SKILLS_DATABASE, rng.randint(4, 14))
+    lines = [
+        name,
+        f"{name.split()[0].lower()}.{rng.randint(1, 9999)}@example.com",
+        f"+1 555-{rng.randint(100, 999)}-{rng.randint(1000, 9999)}",
+        f"{rng.randint(0, 15)} years of experience in {', '.join(skills[:3])}.",
+        rng.choice(DEGREES),
+        'Skills: ' + ', '.join(skills)
+    ]
+    
+    count = sum(len(line.split()) for line in lines)
+    while count < words:
+        sentence = rng.sample(FILLER, 8) + [rng.choice(skills)]
+        lines.append(' '.join(sentence).capitalize() + '.')
+        count += len(sentence)
+    
+    return '\n'.join(lines)
+
+def make_job(rng):
+    skills = rng.sample(ResumeParser.SKILLS_DATABASE, rng.randint(3, 8))
+    return Job(
+        title=rng.choice(TITLES),
+        company=rng.choice(COMPANIES),
+        description=f"Looking for an engineer with {', '.join(skills)}. " + ' '.join(rng.sample(FILLER, 12)),
+        skills_required=','.join(skills),
+        experience_required=rng.randint(0, 8),
+        location='Remote',
+        job_type='Full-time'
+    )
+
+def write_docx(text):
+    document = Document()
+    for line in text.split('\n'):
+        document.add_paragraph(line)
+    
+    out = BytesIO()
+    document.save(out)
+    return out.getvalue()
+
+def write_pdf(text, lines_per_page=60):
+    """Minimal text-only PDF (Helvetica, one content stream per page)"""
+    lines = []
+    for line in text.split('\n'):
+        lines.extend(textwrap.wrap(line, 90) or [''])
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)] or [[]]
+    
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for page in pages:
+        escaped = (line.encode('latin-1', 'replace').replace(b'\\', b'\\\\').replace(b'(', b'\\(').replace(b')', b'\\)') for line in page)
+        stream = b"BT /F1 10 Tf 50 750 Td 12 TL " + b" ".join(b"(" + line + b") Tj T*" for line in escaped) + b" ET"
+        kids.append(f"{len(objects) + 1} 0 R")
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objects) + 2} 0 R >>".encode()
+        )
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n".encode() + stream + b"\nendstream")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(pages)} >>".encode()
+    
+    out = b"%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n".encode() + body + b"\nendobj\n"
+    
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    out += b"".join(f"{offset:010d} 00000 n \n".encode() for offset in offsets)
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return out
+
+def build_corpus(rng, count, words, directory):
+    """Write `count` resumes, alternating DOCX and PDF. Returns [(path, text)]"""
+    corpus = []
+    for i in range(count):
+        text = make_resume_text(rng, words)
+        extension = 'docx' if i % 2 == 0 else 'pdf'
+        path = os.path.join(directory, f"resume_{i:05d}.{extension}")
+        with open(path, 'wb') as f:
+            f.write(write_docx(text) if extension == 'docx' else write_pdf(text))
+        corpus.append((path, text))
+    return corpus
+
+# ========== MEASUREMENT ========== #
+
+def percentile(sorted_samples, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_samples:
+        return 0.0
+    rank = max(math.ceil(pct / 100 * len(sorted_samples)), 1)
+    return sorted_samples[rank - 1]
+
+def measure(func, inputs):
+    """Call func once per input and summarize the per-call latencies"""
+    latencies = []
+    started = time.perf_counter()
+    for item in inputs:
+        t0 = time.perf_counter()
+        func(item)
+        latencies.append(time.perf_counter() - t0)
+    elapsed = time.perf_counter() - started
+    
+    latencies.sort()
+    return {
+        'count': len(latencies),
+        'total_s': round(elapsed, 4),
+        'throughput_per_s': round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        'p50_ms': round(percentile(latencies, 50) * 1000, 3),
+        'p95_ms': round(percentile(latencies, 95) * 1000, 3),
+        'p99_ms': round(percentile(latencies, 99) * 1000, 3),
+        'max_ms': round(latencies[-1] * 1000, 3) if latencies else 0.0
+    }
+
+def run_benchmarks(args):
+    rng = random.Random(args.seed)
+    corpus_dir = os.path.join(WORKDIR, 'corpus')
+    os.makedirs(corpus_dir)
+    app.config['UPLOAD_FOLDER'] = os.path.join(WORKDIR, 'uploads')
+    os.makedirs(app.config['UPLOAD_FOLDER'])
+    app.config['INDEX_FOLDER'] = os.path.join(WORKDIR, 'indexes')
+    # Parse inside the request so /upload latency includes parsing
+    app.config['PARSE_QUEUE_WORKERS'] = 0
+    app.config['REQUEST_LOG_ENABLED'] = False
+    
+    print(f"📄 Generating {args.resumes} resumes (~{args.words} words) and {args.jobs} jobs...")
+    corpus = build_corpus(rng, args.resumes, args.words, corpus_dir)
+    texts = [text for path, text in corpus]
+    results = {}
+    
+    print("⏱️  Parsing...")
+    parsed = []
+    results['parse'] = measure(lambda path: parsed.append(ResumeParser.parse(path)), [path for path, text in corpus])
+    results['extract_skills'] = measure(ResumeParser.extract_skills, texts)
+    results['extract_experience'] = measure(ResumeParser.extract_experience, texts)
+    
+    with app.app_context():
+        db.create_all()
+        upgrade_db()
+        
+        jobs = [make_job(rng) for _ in range(args.jobs)]
+        db.session.add_all(jobs)
+        db.session.add(User(username='bench', password=generate_password_hash('bench')))
+        db.session.commit()
+        
+        resumes = [Resume(**parse_result_columns(result)) for result in parsed if result]
+        pairs = [(resume, job) for resume in resumes for job in jobs][:args.pairs]
+        
+        print("⏱️  Matching...")
+        results['match_pairwise'] = measure(lambda pair: JobMatcher.match(*pair), pairs)
+        
+        matcher = BatchMatcher(jobs)
+        results['match_batch'] = measure(lambda resume: matcher.score([resume]), resumes)
+    
+    print("⏱️  End-to-end /upload + /match...")
+    client = app.test_client()
+    client.post('/login', data={'username': 'bench', 'password': 'bench'})
+    
+    resume_ids = []
+    def upload(item):
+        path, text = item
+        with open(path, 'rb') as f:
+            response = client.post('/upload', data={'resume': (f, os.path.basename(path))}, content_type='multipart/form-data')
+        resume_ids.append(int(response.headers['Location'].rsplit('/', 1)[1]))
+    
+    results['http_upload'] = measure(upload, corpus)
+    results['http_match'] = measure(lambda resume_id: client.get(f'/match/{resume_id}'), resume_ids)
+    
+    return results
+
+# ========== REPORTING ========== #
+
+def print_results(results, baseline=None, threshold=10.0):
+    """Print a table and return the benchmarks that regressed past threshold %"""
+    regressions = []
+    print(f"\n{'benchmark':<20}{'count':>7}{'ops/s':>11}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'vs base':>10}")
+    print("-"*78)
+    
+    for name, stats in results.items():
+        change = ''
+        base = (baseline or {}).get(name)
+        if base and base['p95_ms']:
+            delta = (stats['p95_ms'] - base['p95_ms']) / base['p95_ms'] * 100
+            change = f"{delta:+.1f}%"
+            if delta > threshold:
+                regressions.append(name)
+                change += ' ⚠️'
+        print(f"{name:<20}{stats['count']:>7}{stats['throughput_per_s']:>11.1f}{stats['p50_ms']:>10.2f}"
+              f"{stats['p95_ms']:>10.2f}{stats['p99_ms']:>10.2f}{change:>10}")
+    
+    return regressions
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark parsing and matching hot paths on a synthetic corpus')
+    parser.add_argument('--resumes', type=int, default=50, help='synthetic resumes to generate (half DOCX, half PDF)')
+    parser.add_argument('--jobs', type=int, default=20, help='synthetic job postings to generate')
+    parser.add_argument('--words', type=int, default=400, help='approximate words per resume')
+    parser.add_argument('--pairs', type=int, default=1000, help='resume/job pairs timed with JobMatcher.match')
+    parser.add_argument('--seed', type=int, default=42, help='random seed for the corpus')
+    parser.add_argument('--output', default='benchmark_results.json', help='where to write the JSON results')
+    parser.add_argument('--baseline', help='earlier results JSON to compare against')
+    parser.add_argument('--threshold', type=float, default=10.0, help='p95 slowdown (%%) counted as a regression')
+    args = parser.parse_args()
+    
+    print("="*60)
+    print("🏁 RESUME ANALYZER BENCHMARKS")
+    print("="*60)
+    
+    try:
+        results = run_benchmarks(args)
+    finally:
+        shutil.rmtree(WORKDIR, ignore_errors=True)
+    
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)['results']
+    
+    regressions = print_results(results, baseline, args.threshold)
+    
+    with open(args.output, 'w') as f:
+        json.dump({
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'config': vars(args),
+            'results': results
+        }, f, indent=2)
+    print(f"\n💾 Results saved to {args.output}")
+    
+    if regressions:
+        print(f"❌ Slower than baseline: {', '.join(regressions)}")
+        sys.exit(1)
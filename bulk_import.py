@@ -0,0 +1,165 @@
+import argparse
+import hashlib
+import os
+import sys
+import time
+import zipfile
+from multiprocessing import Pool, cpu_count
+
+from app import app, db, User, Resume, ResumeParser, SkillStore, allowed_file, parse_result_columns, save_upload, upload_filename, upgrade_db
+
+# Per-worker state set up by init_worker
+_source = None
+_archive = None
+_finished = set()
+
+def collect_files(source):
+    """List resume files inside a directory or zip archive"""
+    if os.path.isdir(source):
+        members = []
+        for root, dirs, files in os.walk(source):
+            for name in files:
+                if allowed_file(name):
+                    members.append(os.path.relpath(os.path.join(root, name), source))
+        return sorted(members)
+    
+    with zipfile.ZipFile(source) as archive:
+        return sorted(name for name in archive.namelist() if not name.endswith('/') and allowed_file(name))
+
+def init_worker(source, finished):
+    global _source, _archive, _finished
+    _source = source
+    _archive = None if os.path.isdir(source) else zipfile.ZipFile(source)
+    _finished = finished
+
+def import_one(member):
+    """Parse one resume from memory and store it only if parsing succeeds.
+    
+    Content the user already has is skipped, so re-runs only parse what
+    an interrupted run did not finish.
+    """
+    filename = content_hash = parsed = None
+    error = None
+    
+    try:
+        if _archive is not None:
+            data = _archive.read(member)
+        else:
+            with open(os.path.join(_source, member), 'rb') as src:
+                data = src.read()
+        
+        # Hash so later uploads of the same file reuse this parse
+        content_hash = hashlib.sha256(data).hexdigest()
+        if content_hash in _finished:
+            return member, filename, content_hash, parsed, error
+        
+        extension = os.path.splitext(member)[1][1:].lower()
+        parsed = ResumeParser.parse(data, extension)
+        
+        if parsed:
+            filename = upload_filename(content_hash, extension)
+            save_upload(data, filename)
+    except Exception as e:
+        parsed = None
+        error = str(e)
+    
+    return member, filename, content_hash, parsed, error or 'no text extracted'
+
+def flush(rows):
+    """Insert a batch of Resume rows and their skill links in a single transaction"""
+    if rows:
+        # Text and features are stored once per content, duplicates read through that row
+        held = {
+            content_hash for (content_hash,) in db.session.query(Resume.content_hash)
+            .filter(Resume.content_hash.in_({row['content_hash'] for row in rows}), Resume.features.isnot(None))
+        }
+        for row in rows:
+            if row['content_hash'] in held:
+                row.update(extracted_text=None, features=None, features_version=None)
+            held.add(row['content_hash'])
+        
+        resume_ids = db.session.execute(db.insert(Resume).returning(Resume.id, sort_by_parameter_order=True), rows).scalars().all()
+        SkillStore.link_resumes(db.session.connection(), [(resume_id, row['skills']) for resume_id, row in zip(resume_ids, rows)])
+        db.session.commit()
+        rows.clear()
+
+def bulk_import(source, username, workers, batch_size):
+    if not os.path.isdir(source) and not zipfile.is_zipfile(source):
+        print(f"❌ Not a directory or zip archive: {source}")
+        sys.exit(1)
+    
+    with app.app_context():
+        db.create_all()
+        upgrade_db()
+        
+        user = User.query.filter_by(username=username).first()
+        if not user:
+            print(f"❌ User not found: {username}")
+            sys.exit(1)
+        
+        members = collect_files(source)
+        finished = {
+            content_hash for (content_hash,) in db.session.query(Resume.content_hash)
+            .filter(Resume.user_id == user.id, Resume.content_hash.isnot(None))
+        }
+        
+        print(f"📂 Found {len(members)} resumes")
+        print(f"⚙️  Parsing with {workers} workers\n")
+        
+        rows = []
+        imported = failed = skipped = 0
+        started = time.monotonic()
+        pool = Pool(workers, initializer=init_worker, initargs=(source, finished))
+        
+        try:
+            for member, filename, content_hash, parsed, error in pool.imap_unordered(import_one, members, chunksize=8):
+                if content_hash in finished:
+                    skipped += 1
+                elif parsed:
+                    row = parse_result_columns(parsed)
+                    row.update(
+                        user_id=user.id,
+                        filename=filename,
+                        original_name=os.path.basename(member),
+                        content_hash=content_hash
+                    )
+                    rows.append(row)
+                    imported += 1
+                else:
+                    failed += 1
+                    print(f"⚠️  Failed: {member} ({error})")
+                
+                if len(rows) >= batch_size:
+                    flush(rows)
+                
+                done = imported + failed + skipped
+                if done % 100 == 0:
+                    rate = done / (time.monotonic() - started)
+                    print(f"   {done}/{len(members)} files ({rate:.1f} files/sec, {failed} failed)")
+        except KeyboardInterrupt:
+            print("\n⚠️  Interrupted - saving finished files, re-run to continue")
+        finally:
+            pool.terminate()
+            pool.join()
+            flush(rows)
+        
+        elapsed = time.monotonic() - started
+        print("\n" + "="*60)
+        print(f"✅ Imported: {imported}")
+        print(f"⏭️  Skipped:  {skipped} already imported")
+        print(f"❌ Failed:   {failed}")
+        print(f"⏱️  {elapsed:.1f}s ({(imported + failed + skipped) / elapsed if elapsed else 0:.1f} files/sec)")
+        print("="*60)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Bulk import resumes from a directory or zip archive')
+    parser.add_argument('source', help='directory or .zip file containing PDF/DOCX resumes')
+    parser.add_argument('--user', default='admin', help='username that will own the imported resumes')
+    parser.add_argument('--workers', type=int, default=cpu_count(), help='parser processes (default: all cores)')
+    parser.add_argument('--batch-size', type=int, default=500, help='rows per insert transaction')
+    args = parser.parse_args()
+    
+    print("="*60)
+    print("📥 BULK RESUME IMPORT")
+    print("="*60)
+    bulk_import(args.source, args.user, args.workers, args.batch_size)
@@ -0,0 +1,173 @@
+import argparse
+import json
+import sys
+
+from app import app, db, Resume, Match, Job, JobMatcher, upgrade_db
+
+def database_size():
+    with db.engine.connect() as conn:
+        return conn.exec_driver_sql("PRAGMA page_count").scalar() * conn.exec_driver_sql("PRAGMA page_size").scalar()
+
+def compress_resume_text(batch_size):
+    """Rewrite plain-text extracted_text values in compressed form"""
+    table = Resume.__table__
+    rewrite = table.update().where(table.c.id == db.bindparam('resume_id')).values(extracted_text=db.bindparam('text'))
+    last_id = 0
+    total = 0
+    
+    while True:
+        rows = db.session.execute(
+            db.select(table.c.id, table.c.extracted_text)
+            .where(table.c.id > last_id, db.func.typeof(table.c.extracted_text) == 'text')
+            .order_by(table.c.id).limit(batch_size)
+        ).all()
+        if not rows:
+            break
+        
+        db.session.execute(rewrite, [{'resume_id': resume_id, 'text': text} for resume_id, text in rows])
+        db.session.commit()
+        last_id = rows[-1][0]
+        total += len(rows)
+    
+    return total
+
+def share_duplicate_text(batch_size):
+    """Keep the text and features of identical resumes on the first row only"""
+    table = Resume.__table__
+    holder = table.alias('holder')
+    first_holder = (
+        db.select(db.func.min(holder.c.id))
+        .where(holder.c.content_hash == table.c.content_hash, holder.c.features.isnot(None))
+        .scalar_subquery()
+    )
+    last_id = 0
+    total = 0
+    
+    while True:
+        ids = db.session.execute(
+            db.select(table.c.id)
+            .where(table.c.id > last_id, table.c.content_hash.isnot(None), table.c.features.isnot(None), table.c.id > first_holder)
+            .order_by(table.c.id).limit(batch_size)
+        ).scalars().all()
+        if not ids:
+            break
+        
+        db.session.execute(table.update().where(table.c.id.in_(ids)).values(extracted_text=None, features=None, features_version=None))
+        db.session.commit()
+        last_id = ids[-1]
+        total += len(ids)
+    
+    return total
+
+def pack_match_skills(batch_size):
+    """Replace JSON matching/missing skill lists with skill bitsets"""
+    table = Match.__table__
+    rewrite = table.update().where(table.c.id == db.bindparam('match_id')).values(
+        skill_mask=db.bindparam('mask'), matching_skills=None, missing_skills=None
+    )
+    job_skills = {job_id: JobMatcher.job_skill_set(skills) for job_id, skills in db.session.query(Job.id, Job.skills_required)}
+    last_id = 0
+    total = 0
+    
+    while True:
+        rows = db.session.execute(
+            db.select(table.c.id, table.c.job_id, table.c.matching_skills)
+            .where(table.c.id > last_id, table.c.skill_mask.is_(None))
+            .order_by(table.c.id).limit(batch_size)
+        ).all()
+        if not rows:
+            break
+        
+        db.session.execute(rewrite, [
+            {
+                'match_id': match_id,
+                'mask': Match.pack_skill_mask(
+                    job_skills.get(job_id, set()) & set(skill.lower() for skill in json.loads(matching or '[]'))
+                )
+            }
+            for match_id, job_id, matching in rows
+        ])
+        db.session.commit()
+        last_id = rows[-1][0]
+        total += len(rows)
+    
+    return total
+
+def repack_skill_masks(batch_size):
+    """Rewrite skill bitsets that are larger than a sparse list of their skill ids"""
+    table = Match.__table__
+    rewrite = table.update().where(table.c.id == db.bindparam('match_id')).values(skill_mask=db.bindparam('mask'))
+    last_id = 0
+    total = 0
+    
+    while True:
+        rows = db.session.execute(
+            db.select(table.c.id, table.c.skill_mask)
+            .where(table.c.id > last_id, table.c.skill_mask.isnot(None))
+            .order_by(table.c.id).limit(batch_size)
+        ).all()
+        if not rows:
+            break
+        
+        repacked = []
+        for match_id, mask in rows:
+            packed = Match.pack_skill_ids(Match.unpack_skill_ids(mask))
+            if len(packed) < len(mask):
+                repacked.append({'match_id': match_id, 'mask': packed})
+        if repacked:
+            db.session.execute(rewrite, repacked)
+            db.session.commit()
+        last_id = rows[-1][0]
+        total += len(repacked)
+    
+    return total
+
+def compress_database(batch_size):
+    try:
+        with app.app_context():
+            db.create_all()
+            upgrade_db()
+            
+            if db.engine.dialect.name != 'sqlite':
+                print("❌ compress_db.py only rewrites SQLite databases")
+                sys.exit(1)
+            
+            before = database_size()
+            
+            duplicates = share_duplicate_text(batch_size)
+            print(f"✅ Dropped copied text and features of {duplicates} duplicate resumes")
+            
+            resumes = compress_resume_text(batch_size)
+            print(f"✅ Compressed extracted text of {resumes} resumes")
+            
+            matches = pack_match_skills(batch_size)
+            print(f"✅ Packed skill lists of {matches} matches")
+            
+            repacked = repack_skill_masks(batch_size)
+            print(f"✅ Shrank skill bitsets of {repacked} matches")
+            
+            # Give the freed pages back to the filesystem
+            with db.engine.connect().execution_options(isolation_level='AUTOCOMMIT') as conn:
+                conn.exec_driver_sql("VACUUM")
+                conn.exec_driver_sql("ANALYZE")
+            
+            after = database_size()
+            print(f"✅ Database size: {before / 1024 / 1024:.1f} MB -> {after / 1024 / 1024:.1f} MB")
+        
+        print("\n" + "="*60)
+        print("🎉 DATABASE COMPRESSION COMPLETE!")
+        print("="*60)
+    
+    except Exception as e:
+        print(f"❌ Error compressing database: {e}")
+        sys.exit(1)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Compress resume text and match skill lists in an existing database')
+    parser.add_argument('--batch-size', type=int, default=1000, help='rows rewritten per transaction')
+    args = parser.parse_args()
+    
+    print("="*60)
+    print("🗜️  COMPRESSING DATABASE")
+    print("="*60)
+    compress_database(args.batch_size)
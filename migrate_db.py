@@ -0,0 +1,35 @@
+import sys
+
+def migrate_database():
+    """Bring an existing database up to the current schema and performance profile"""
+    try:
+        from app import app, db, upgrade_db
+        
+        with app.app_context():
+            db.create_all()
+            upgrade_db()
+            print("✅ Schema and indexes up to date")
+            
+            if db.engine.dialect.name == 'sqlite':
+                with db.engine.connect() as conn:
+                    mode = conn.exec_driver_sql("PRAGMA journal_mode").scalar()
+                    print(f"✅ Journal mode: {mode}")
+                    
+                    # Refresh planner statistics for the new indexes
+                    conn.exec_driver_sql("ANALYZE")
+                    conn.exec_driver_sql("PRAGMA optimize")
+                    print("✅ Query planner statistics updated")
+        
+        print("\n" + "="*60)
+        print("🎉 DATABASE MIGRATION COMPLETE!")
+        print("="*60)
+        
+    except Exception as e:
+        print(f"❌ Error migrating database: {e}")
+        sys.exit(1)
+
+if __name__ == '__main__':
+    print("="*60)
+    print("🔧 MIGRATING DATABASE")
+    print("="*60)
+    migrate_database()
@@ -1,8 +1,12 @@
 import os
+import shutil
 import sys
 
 def reset_database():
     """Force delete and recreate database"""
+    # Importing app only configures it, the database is opened on first use
+    from app import app, db, User, generate_password_hash, Job, upgrade_db
+    
     db_file = 'resume.db'
     
     # Check if database exists
@@ -21,15 +25,20 @@ def reset_database():
     else:
         print("⚠️  No old database found (this is fine)")
     
+    # The job index on disk describes the old database's jobs
+    index_folder = app.config['INDEX_FOLDER']
+    if index_folder and os.path.isdir(index_folder):
+        shutil.rmtree(index_folder, ignore_errors=True)
+        print(f"✅ Deleted old job index: {index_folder}")
+    
     # Import app and create fresh database
     print("\n🔄 Creating new database...")
     
     try:
-        from app import app, db, User, generate_password_hash, Job
-        
         with app.app_context():
             # Create all tables
             db.create_all()
+            upgrade_db()
             print("✅ Created database tables")
             
             # Create admin user
@@ -0,0 +1,65 @@
+import io
+import os
+import sys
+import tempfile
+
+import pytest
+
+# app.py reads DATABASE_URL and creates uploads/ at import time
+WORKDIR = tempfile.mkdtemp(prefix='resume-tests-')
+DATABASE = os.path.join(WORKDIR, 'test.db')
+os.environ['DATABASE_URL'] = 'sqlite:///' + DATABASE
+os.chdir(WORKDIR)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app as resume_app  # noqa: E402
+from docx import Document  # noqa: E402
+from werkzeug.datastructures import FileStorage  # noqa: E402
+
+@pytest.fixture
+def app_module(tmp_path, monkeypatch):
+    """The app module on a fresh database, inside an app context"""
+    flask_app = resume_app.app
+    monkeypatch.setitem(flask_app.config, 'UPLOAD_FOLDER', str(tmp_path / 'uploads'))
+    monkeypatch.setitem(flask_app.config, 'INDEX_FOLDER', None)
+    monkeypatch.setitem(flask_app.config, 'PARSE_QUEUE_WORKERS', 0)
+    monkeypatch.setitem(flask_app.config, 'REQUEST_LOG_ENABLED', False)
+    monkeypatch.setitem(flask_app.config, 'TESTING', True)
+    
+    # Process-wide caches would otherwise carry state between databases
+    monkeypatch.setattr(resume_app, 'job_index', resume_app.JobIndex(shared=True))
+    monkeypatch.setattr(resume_app, 'candidate_index', resume_app.CandidateIndex())
+    monkeypatch.setattr(resume_app, 'admin_stats', resume_app.StatsCache())
+    monkeypatch.setattr(resume_app.SkillStore, '_ids', {})
+    monkeypatch.setattr(resume_app.SkillStore, '_names', {})
+    monkeypatch.setattr(resume_app.parse_queue, 'notify', lambda: None)
+    
+    with flask_app.app_context():
+        resume_app.db.engine.dispose()
+    for suffix in ('', '-wal', '-shm'):
+        if os.path.exists(DATABASE + suffix):
+            os.remove(DATABASE + suffix)
+    resume_app.init_db()
+    
+    with flask_app.app_context():
+        yield resume_app
+        resume_app.db.session.remove()
+
+@pytest.fixture
+def make_docx():
+    def build(text):
+        document = Document()
+        for line in text.split('\n'):
+            document.add_paragraph(line)
+        buffer = io.BytesIO()
+        document.save(buffer)
+        return buffer.getvalue()
+    return build
+
+@pytest.fixture
+def upload(app_module, make_docx):
+    """Ingest a DOCX with the given text for the admin user"""
+    def ingest(text, name='resume.docx', data=None):
+        data = make_docx(text) if data is None else data
+        return app_module.ingest_upload(FileStorage(io.BytesIO(data), name), 1)
+    return ingest
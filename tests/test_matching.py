@@ -0,0 +1,117 @@
+import random
+
+import numpy as np
+import pytest
+
+SKILLS = ['python', 'django', 'java', 'sql', 'docker', 'kubernetes', 'react', 'aws', 'linux', 'excel']
+
+@pytest.fixture
+def board(app_module, upload, monkeypatch):
+    """Twelve resumes and a job board, matched with a top-3 and two runner-ups"""
+    monkeypatch.setitem(app_module.app.config, 'MATCH_TOP_K', 3)
+    monkeypatch.setitem(app_module.app.config, 'MATCH_RUNNER_UPS', 2)
+    monkeypatch.setitem(app_module.app.config, 'BATCH_MATCH_CHUNK_SIZE', 5)
+    # Text similarity moves with the IDF of the whole board, which would blur
+    # comparisons between incremental updates and a full re-score
+    monkeypatch.setattr(
+        app_module.JobIndex, 'similarity_matrix',
+        lambda self, term_counts, job_ids, candidates=None: np.zeros((len(term_counts), len(job_ids)))
+    )
+    
+    rng = random.Random(7)
+    for i in range(12):
+        upload(f"Candidate {i}\n{rng.randint(0, 9)} years of experience with " + ', '.join(rng.sample(SKILLS, 4)), f'{i}.docx')
+    for i in range(4):
+        add_job(app_module, rng)
+    app_module.BatchMatcher.rematch_all()
+    return rng
+
+def add_job(app_module, rng):
+    job = app_module.Job(
+        title='Engineer', company='Acme', description='engineer role',
+        skills_required=', '.join(rng.sample(SKILLS, 3)), experience_required=rng.randint(0, 6)
+    )
+    app_module.db.session.add(job)
+    app_module.db.session.commit()
+    return job
+
+def fresh_scores(app_module):
+    """resume_id -> {job_id: score} against the active jobs, computed from scratch"""
+    matcher = app_module.BatchMatcher(app_module.Job.query.filter_by(is_active=True).all())
+    resumes = app_module.Resume.query.order_by(app_module.Resume.id).all()
+    scores, _ = matcher.score(resumes)
+    return {resume.id: dict(zip(matcher.job_ids, row.tolist())) for resume, row in zip(resumes, scores)}
+
+def assert_exact_top_k(app_module, k=3):
+    for resume_id, scores in fresh_scores(app_module).items():
+        stored = [match.job_id for match in app_module.Match.query.filter_by(resume_id=resume_id)]
+        expected = sorted(scores.values(), reverse=True)[:k]
+        assert sorted((scores[job_id] for job_id in stored), reverse=True) == pytest.approx(expected)
+
+def test_rematch_stores_top_k_and_runner_ups(app_module, board):
+    scores = fresh_scores(app_module)
+    
+    for resume in app_module.Resume.query.all():
+        matches = app_module.Match.query.filter_by(resume_id=resume.id).order_by(app_module.Match.match_score.desc()).all()
+        ranked = sorted(scores[resume.id].items(), key=lambda item: -item[1])
+        
+        assert [match.match_score for match in matches] == pytest.approx([score for job_id, score in ranked[:3]])
+        runner_ups = app_module.BatchMatcher.unpack_runner_ups(resume.runner_ups)
+        assert [score for job_id, score in runner_ups] == pytest.approx([score for job_id, score in ranked[3:5]])
+
+def test_removed_job_is_refilled_from_runner_ups(app_module, board, monkeypatch):
+    top_job = app_module.Match.query.order_by(app_module.Match.match_score.desc()).first().job_id
+    job = app_module.db.session.get(app_module.Job, top_job)
+    job.is_active = False
+    app_module.db.session.commit()
+    
+    rescored = []
+    monkeypatch.setattr(app_module.BatchMatcher, 'save', lambda self, resumes, *args, **kwargs: rescored.extend(resumes))
+    app_module.BatchMatcher.remove_job_matches(top_job)
+    
+    assert rescored == []
+    assert app_module.Match.query.filter_by(job_id=top_job).count() == 0
+    for resume in app_module.Resume.query.all():
+        assert app_module.Match.query.filter_by(resume_id=resume.id).count() == 3
+        assert top_job not in dict(app_module.BatchMatcher.unpack_runner_ups(resume.runner_ups))
+    assert_exact_top_k(app_module)
+
+def test_job_changes_keep_the_top_k_exact(app_module, board):
+    for step in range(25):
+        active = app_module.Job.query.filter_by(is_active=True).all()
+        inactive = app_module.Job.query.filter_by(is_active=False).all()
+        action = board.random()
+        
+        if action < 0.35 or len(active) < 2:
+            job = add_job(app_module, board)
+            app_module.BatchMatcher.add_job_matches(job)
+        elif action < 0.55 and inactive:
+            job = board.choice(inactive)
+            job.is_active = True
+            app_module.db.session.commit()
+            app_module.BatchMatcher.add_job_matches(job)
+        elif action < 0.8:
+            job = board.choice(active)
+            job.is_active = False
+            app_module.job_index.remove(job.id)
+            app_module.BatchMatcher.remove_job_matches(job.id)
+        else:
+            job_id = board.choice(active).id
+            app_module.BatchMatcher.remove_job_matches(job_id)
+            app_module.db.session.delete(app_module.db.session.get(app_module.Job, job_id))
+            app_module.db.session.commit()
+            app_module.job_index.remove(job_id)
+        
+        assert_exact_top_k(app_module)
+
+def test_top_k_selects_the_best_columns_in_order(app_module):
+    scores = np.array([[0.1, 0.9, 0.5, 0.7], [3.0, 1.0, 2.0, 0.0]])
+    
+    assert app_module.BatchMatcher.top_k(scores, 2).tolist() == [[1, 3], [0, 2]]
+    assert app_module.BatchMatcher.top_k(scores, 0).tolist() == [[1, 3, 2, 0], [0, 2, 1, 3]]
+
+def test_runner_ups_round_trip(app_module):
+    entries = [(12, 81.5), (3, 40.25)]
+    
+    assert app_module.BatchMatcher.unpack_runner_ups(app_module.BatchMatcher.pack_runner_ups(entries)) == entries
+    assert app_module.BatchMatcher.unpack_runner_ups(None) == []
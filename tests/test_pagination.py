@@ -0,0 +1,75 @@
+from datetime import datetime, timedelta
+
+import pytest
+from werkzeug.exceptions import BadRequest
+
+@pytest.fixture
+def jobs(app_module):
+    """25 jobs whose posted dates tie in groups of five, newest first"""
+    app_module.Job.query.delete()
+    app_module.db.session.commit()
+    start = datetime(2024, 1, 1)
+    for i in range(25):
+        app_module.db.session.add(app_module.Job(
+            title=f'Job {i}', company='Acme', description='role', posted_date=start + timedelta(days=i // 5)
+        ))
+    app_module.db.session.commit()
+    # Ties are broken by the higher id
+    return [job.id for job in app_module.Job.query.order_by(app_module.Job.posted_date.desc(), app_module.Job.id.desc())]
+
+def page(app_module, **args):
+    query = '&'.join(f'{key}={value}' for key, value in args.items())
+    with app_module.app.test_request_context(f'/?{query}'):
+        items, next_cursor, prev_cursor = app_module.keyset_page(app_module.Job.query, app_module.Job.posted_date, app_module.Job.id)
+    return [job.id for job in items], next_cursor, prev_cursor
+
+def walk_forward(app_module, per_page):
+    """[(ids, prev_cursor)] of every page, following the next cursors"""
+    pages = []
+    ids, next_cursor, prev_cursor = page(app_module, per_page=per_page)
+    pages.append((ids, prev_cursor))
+    while next_cursor:
+        ids, next_cursor, prev_cursor = page(app_module, per_page=per_page, after=next_cursor)
+        pages.append((ids, prev_cursor))
+    return pages
+
+def test_cursor_round_trip(app_module):
+    timestamp = datetime(2024, 5, 17, 8, 30, 15, 123456)
+    
+    assert app_module.decode_cursor(app_module.encode_cursor(timestamp, 42)) == (timestamp, 42)
+
+def test_malformed_cursor_is_a_bad_request(app_module):
+    with pytest.raises(BadRequest):
+        app_module.decode_cursor('not-a-cursor')
+
+def test_forward_pages_cover_every_row_once(app_module, jobs):
+    pages = walk_forward(app_module, 7)
+    
+    assert [len(ids) for ids, prev_cursor in pages] == [7, 7, 7, 4]
+    assert [job_id for ids, prev_cursor in pages for job_id in ids] == jobs
+    assert pages[0][1] is None
+    assert all(prev_cursor for ids, prev_cursor in pages[1:])
+
+def test_backward_pages_retrace_the_forward_ones(app_module, jobs):
+    pages = walk_forward(app_module, 4)
+    
+    ids, prev_cursor = pages[-1]
+    backward = [ids]
+    while prev_cursor:
+        ids, next_cursor, prev_cursor = page(app_module, per_page=4, before=prev_cursor)
+        backward.append(ids)
+    
+    assert backward[::-1] == [ids for ids, prev_cursor in pages]
+
+def test_rows_added_while_paging_are_not_repeated(app_module, jobs):
+    first, next_cursor, prev_cursor = page(app_module, per_page=10)
+    app_module.db.session.add(app_module.Job(title='Newest', company='Acme', description='role', posted_date=datetime(2030, 1, 1)))
+    app_module.db.session.commit()
+    
+    second, next_cursor, prev_cursor = page(app_module, per_page=10, after=next_cursor)
+    
+    assert second == jobs[10:20]
+
+def test_page_size_is_clamped(app_module, jobs):
+    assert len(page(app_module, per_page=0)[0]) == 1
+    assert len(page(app_module, per_page=1000)[0]) == 25
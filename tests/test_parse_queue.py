@@ -0,0 +1,105 @@
+import os
+from datetime import datetime, timedelta
+
+import pytest
+
+RESUME = "John Smith\n6 years of experience with Java, Spring and Docker"
+
+@pytest.fixture
+def queued(app_module, monkeypatch):
+    """Uploads are queued for background parsing, but nothing dispatches them"""
+    monkeypatch.setitem(app_module.app.config, 'PARSE_QUEUE_WORKERS', 2)
+    return app_module
+
+def staged(app_module):
+    folder = app_module.staging_folder()
+    return sorted(os.listdir(folder)) if os.path.isdir(folder) else []
+
+def in_store(app_module, filename):
+    return os.path.exists(os.path.join(app_module.app.config['UPLOAD_FOLDER'], filename))
+
+def parse(app_module, resume):
+    """What a pool worker would return for a queued resume"""
+    return app_module.ResumeParser.parse(app_module.queued_upload_path(resume.filename))
+
+def test_queued_upload_waits_in_staging(queued, upload):
+    resume, error = upload(RESUME)
+    
+    assert error is None
+    assert resume.status == 'pending'
+    assert staged(queued) == [os.path.basename(resume.filename)]
+    assert not in_store(queued, resume.filename)
+
+def test_successful_parse_promotes_the_staged_file(queued, upload):
+    resume, _ = upload(RESUME)
+    
+    queued.finish_parse(resume.id, parse(queued, resume))
+    
+    assert resume.status == 'done'
+    assert 'java' in queued.SkillStore.resume_skills(resume.id)
+    assert in_store(queued, resume.filename)
+    assert staged(queued) == []
+
+def test_failed_parse_drops_the_staged_file(queued, upload):
+    resume, _ = upload(RESUME)
+    
+    queued.finish_parse(resume.id, None, 'Parsing timed out after 60s')
+    
+    assert resume.status == 'failed'
+    assert resume.parse_error == 'Parsing timed out after 60s'
+    assert staged(queued) == []
+    assert not in_store(queued, resume.filename)
+
+def test_queued_duplicates_share_one_staged_file(queued, upload, make_docx):
+    data = make_docx(RESUME)
+    first, _ = upload(None, 'a.docx', data)
+    second, _ = upload(None, 'b.docx', data)
+    assert first.status == second.status == 'pending'
+    assert len(staged(queued)) == 1
+    
+    # The staged bytes stay while the other row still waits for them
+    queued.finish_parse(first.id, parse(queued, first))
+    assert in_store(queued, first.filename)
+    assert len(staged(queued)) == 1
+    
+    queued.finish_parse(second.id, parse(queued, second))
+    assert staged(queued) == []
+    assert second.status == 'done'
+    assert second.features is None
+    assert queued.ResumeFeatures.of(second) == queued.ResumeFeatures.of(first)
+
+def test_lost_upload_fails_only_after_the_cutoff(queued, upload, make_docx):
+    kept, _ = upload(RESUME, 'kept.docx')
+    lost, _ = upload("Other resume with Python", 'lost.docx')
+    os.remove(queued.staging_path(lost.filename))
+    
+    queued.parse_queue._fail_lost()
+    assert lost.status == 'pending'
+    
+    queued.Resume.query.update({'uploaded_at': datetime.utcnow() - timedelta(hours=1)})
+    queued.db.session.commit()
+    queued.parse_queue._fail_lost()
+    queued.db.session.expire_all()
+    
+    assert queued.db.session.get(queued.Resume, lost.id).status == 'failed'
+    assert queued.db.session.get(queued.Resume, kept.id).status == 'pending'
+
+def test_stale_claims_return_to_the_queue(queued, upload):
+    resume, _ = upload(RESUME)
+    resume.status = 'parsing'
+    resume.parse_started_at = datetime.utcnow() - timedelta(hours=1)
+    queued.db.session.commit()
+    
+    queued.parse_queue._requeue_stale()
+    queued.db.session.expire_all()
+    
+    assert queued.db.session.get(queued.Resume, resume.id).status == 'pending'
+
+def test_full_queue_rejects_uploads(queued, upload, monkeypatch):
+    monkeypatch.setitem(queued.app.config, 'PARSE_QUEUE_MAX_LENGTH', 1)
+    upload(RESUME)
+    
+    resume, error = upload("Another resume with Go and Rust", 'other.docx')
+    
+    assert resume is None
+    assert error.startswith('Too many resumes')
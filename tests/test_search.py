@@ -0,0 +1,54 @@
+import pytest
+
+@pytest.fixture
+def board(app_module):
+    app_module.Job.query.delete()
+    app_module.db.session.commit()
+    for title, company, skills, active in (
+        ('Python Developer', 'Snake Works', 'python, django', True),
+        ('Data Analyst', 'Numbers Inc', 'sql, excel, python', True),
+        ('Java Engineer', 'Bean Corp', 'java, spring', True),
+        ('Retired Python Role', 'Old Co', 'python', False),
+    ):
+        app_module.db.session.add(app_module.Job(title=title, company=company, description='role', skills_required=skills, is_active=active))
+    app_module.db.session.commit()
+    return app_module
+
+def titles(jobs):
+    return [job.title for job in jobs]
+
+def test_fts_index_is_available(board):
+    assert board.JobSearch.available()
+
+def test_prefix_terms_match_and_title_hits_rank_first(board):
+    jobs, total = board.JobSearch.search('pyth', 1, 10)
+    
+    assert total == 2
+    assert titles(jobs) == ['Python Developer', 'Data Analyst']
+
+def test_inactive_jobs_are_not_found(board):
+    assert board.JobSearch.search('retired', 1, 10) == ([], 0)
+
+def test_search_pages_share_one_total(board):
+    first, total = board.JobSearch.search('python', 1, 1)
+    second, _ = board.JobSearch.search('python', 2, 1)
+    
+    assert total == 2
+    assert titles(first + second) == ['Python Developer', 'Data Analyst']
+
+def test_index_follows_job_edits_and_deletes(board):
+    job = board.Job.query.filter_by(title='Java Engineer').one()
+    job.title = 'Kotlin Engineer'
+    board.db.session.commit()
+    
+    assert titles(board.JobSearch.search('kotlin', 1, 10)[0]) == ['Kotlin Engineer']
+    # Still found through its skills
+    assert board.JobSearch.search('java', 1, 10)[1] == 1
+    
+    board.db.session.delete(job)
+    board.db.session.commit()
+    assert board.JobSearch.search('kotlin', 1, 10) == ([], 0)
+
+def test_query_syntax_is_quoted_away(board):
+    assert board.JobSearch.to_fts_query('C++ "OR" data-analyst') == '"c"* "or"* "data"* "analyst"*'
+    assert board.JobSearch.search('"*:()', 1, 10) == ([], 0)
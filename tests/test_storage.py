@@ -0,0 +1,59 @@
+import pytest
+
+TEXT = "Professional experience\nSenior engineer, 5 years of experience in Python and SQL. Café, naïve, 東京"
+
+def test_compressed_text_round_trip(app_module):
+    column = app_module.CompressedText()
+    
+    for text in (TEXT, '', 'x' * 5000):
+        stored = column.process_bind_param(text, None)
+        assert stored[0] == app_module.CompressedText.FORMAT
+        assert column.process_result_value(stored, None) == text
+    assert column.process_bind_param(None, None) is None
+    assert column.process_result_value(None, None) is None
+
+def test_compressed_text_is_smaller_for_resume_text(app_module):
+    text = (TEXT + "\n") * 20
+    
+    assert len(app_module.CompressedText().process_bind_param(text, None)) < len(text.encode('utf-8')) / 4
+
+def test_resume_text_is_stored_compressed(app_module, upload):
+    resume, _ = upload("Jane Doe with Python")
+    table = app_module.Resume.__table__
+    
+    raw = app_module.db.session.execute(
+        app_module.db.text("SELECT typeof(extracted_text) FROM resume WHERE id = :id"), {'id': resume.id}
+    ).scalar()
+    app_module.db.session.execute(table.update().where(table.c.id == resume.id).values(extracted_text=app_module.db.literal('legacy plain text', app_module.db.Text)))
+    app_module.db.session.commit()
+    app_module.db.session.expire_all()
+    
+    assert raw == 'blob'
+    # Rows written before compression still read back as they were
+    assert app_module.db.session.get(app_module.Resume, resume.id).extracted_text == 'legacy plain text'
+
+def test_unknown_compression_format_is_rejected(app_module):
+    with pytest.raises(ValueError):
+        app_module.CompressedText().process_result_value(b'\x09abc', None)
+
+@pytest.mark.parametrize('skill_ids', [[], [1], [3, 5, 7], list(range(1, 40)), [2, 900, 70000]])
+def test_skill_ids_round_trip(app_module, skill_ids):
+    assert app_module.Match.unpack_skill_ids(app_module.Match.pack_skill_ids(skill_ids)) == skill_ids
+
+def test_skill_ids_pick_the_smaller_encoding(app_module):
+    dense = app_module.Match.pack_skill_ids(range(1, 40))
+    sparse = app_module.Match.pack_skill_ids([5, 70000])
+    
+    assert dense[0] != app_module.Match.SPARSE_SKILLS and len(dense) == 5
+    assert sparse[0] == app_module.Match.SPARSE_SKILLS and len(sparse) == 5
+
+def test_legacy_skill_bitsets_still_decode(app_module):
+    mask = (1 << 3) | (1 << 10) | (1 << 64)
+    
+    assert app_module.Match.unpack_skill_ids(mask.to_bytes(9, 'little')) == [3, 10, 64]
+
+def test_match_skill_lists_follow_the_job(app_module):
+    job = app_module.Job.query.filter_by(title='Senior Python Developer').one()
+    match = app_module.Match(job=job, match_score=50, skill_mask=app_module.Match.pack_skill_mask({'python', 'django'}))
+    
+    assert match.skill_lists() == (['django', 'python'], ['flask', 'git', 'postgresql', 'rest api'])
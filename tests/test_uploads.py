@@ -0,0 +1,72 @@
+import os
+
+RESUME = "Jane Doe\njane@example.com\n4 years of experience in Python, Django and SQL\nBachelor of Science"
+
+def stored_files(app_module):
+    found = []
+    for root, dirs, files in os.walk(app_module.app.config['UPLOAD_FOLDER']):
+        found.extend(os.path.relpath(os.path.join(root, name), app_module.app.config['UPLOAD_FOLDER']) for name in files)
+    return sorted(found)
+
+def test_upload_is_parsed_and_stored_by_content_hash(app_module, upload):
+    resume, error = upload(RESUME)
+    
+    assert error is None
+    assert resume.status == 'done'
+    assert resume.filename == app_module.upload_filename(resume.content_hash, 'docx')
+    assert stored_files(app_module) == [resume.filename]
+    assert set(app_module.SkillStore.resume_skills(resume.id)) >= {'python', 'django', 'sql'}
+
+def test_duplicate_upload_reuses_file_and_parse(app_module, upload, make_docx):
+    data = make_docx(RESUME)
+    first, _ = upload(None, 'a.docx', data)
+    second, _ = upload(None, 'b.docx', data)
+    
+    assert second.filename == first.filename
+    assert stored_files(app_module) == [first.filename]
+    assert (second.skills, second.score, second.email) == (first.skills, first.score, first.email)
+    
+    # Only the first row holds the text and features, the duplicate reads through it
+    assert second.extracted_text is None and second.features is None
+    assert app_module.ResumeFeatures.of(second) == app_module.ResumeFeatures.of(first)
+
+def test_deleting_the_holder_hands_content_to_a_duplicate(app_module, upload, make_docx):
+    data = make_docx(RESUME)
+    first, _ = upload(None, 'a.docx', data)
+    second, _ = upload(None, 'b.docx', data)
+    features = app_module.ResumeFeatures.of(first)
+    second_id = second.id
+    
+    app_module.db.session.delete(first)
+    app_module.db.session.commit()
+    app_module.db.session.expire_all()
+    
+    heir = app_module.db.session.get(app_module.Resume, second_id)
+    assert heir.features is not None and heir.extracted_text
+    assert app_module.ResumeFeatures.of(heir) == features
+
+def test_shared_file_is_released_with_its_last_resume(app_module, upload, make_docx):
+    data = make_docx(RESUME)
+    first, _ = upload(None, 'a.docx', data)
+    second, _ = upload(None, 'b.docx', data)
+    filename, content_hash = first.filename, first.content_hash
+    
+    app_module.db.session.delete(first)
+    app_module.db.session.commit()
+    app_module.release_upload(filename, content_hash)
+    assert stored_files(app_module) == [filename]
+    
+    app_module.db.session.delete(second)
+    app_module.db.session.commit()
+    app_module.release_upload(filename, content_hash)
+    assert stored_files(app_module) == []
+
+def test_rejected_uploads_leave_nothing_behind(app_module, upload):
+    assert upload(RESUME, 'resume.txt') == (None, 'Invalid file type. Only PDF and DOCX allowed')
+    assert upload(RESUME, '') == (None, 'No file selected')
+    assert app_module.ingest_upload(None, 1) == (None, 'No file selected')
+    
+    resume, error = upload(None, 'broken.docx', b'not a docx file')
+    assert resume is None and error
+    assert stored_files(app_module) == []
+    assert app_module.Resume.query.count() == 0